@@ -0,0 +1,30 @@
+"""
+JSON helpers shared by the scripts: orjson when it is installed, the
+stdlib json module otherwise. Everything works in bytes, so output is
+written with write_bytes / a binary file.
+
+Scripts under scripts/analysis get these through _ercot_cache.
+"""
+import json
+from pathlib import Path
+
+try:
+    import orjson
+
+    loads_json = orjson.loads
+
+    def dumps_json(obj, indent=False):
+        """Compact UTF-8 JSON bytes (two-space indented if indent)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    loads_json = json.loads
+
+    def dumps_json(obj, indent=False):
+        """Compact UTF-8 JSON bytes (two-space indented if indent)."""
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def load_json(path):
+    """Parse the JSON file at path."""
+    return loads_json(Path(path).read_bytes())
@@ -0,0 +1,261 @@
+"""
+Shared, memoized loaders for the ERCOT county GeoJSON files.
+
+The story1 county scripts all look counties up by name in the same
+statewide files; caching the parsed indexes per path means a driver that
+runs several of them in one process only parses each file once. The
+returned dicts are shared between callers, so treat them as read-only.
+
+iter_features / iter_feature_properties are also the streaming GeoJSON
+readers for the other story1 scripts; the iter_projected_* variants read
+the slimmer copies from build_geojson_projections.py when those are current.
+cached_pickle keeps any other derived value in data/cache alongside them.
+"""
+import mmap
+import pickle
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import ijson
+    HAVE_IJSON = True
+except ImportError:
+    HAVE_IJSON = False
+
+import _paths  # noqa: F401
+from _jsonio import dumps_json, load_json, loads_json
+
+CACHE_ROOT = Path(__file__).resolve().parent.parent.parent / 'data/cache'
+# Per-county sidecars of the GIS report, written by build_ercot_shards.py
+SHARD_ROOT = CACHE_ROOT / 'ercot_shards'
+# Field-projected copies of the input GeoJSONs, written by build_geojson_projections.py
+PROJECTION_ROOT = CACHE_ROOT / 'geojson_projections'
+
+# Properties the story1 scripts read from each input
+DC_FIELDS = ('location', 'project_name', 'size_mw', 'status')
+ERCOT_COUNTY_FIELDS = ('NAME', 'project_count', 'total_capacity_mw')
+
+@contextmanager
+def _mapped(path):
+    """Read-only mmap of `path` for ijson to pull from the page cache
+    (plain file object for empty files, which can't be mapped)."""
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            f.seek(0)
+            yield f
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+def iter_features(path):
+    """Yield the features of a GeoJSON FeatureCollection one at a time.
+
+    Streams with ijson when installed instead of materializing the whole
+    collection; otherwise falls back to load_json.
+    """
+    if not HAVE_IJSON:
+        yield from load_json(path).get('features', [])
+        return
+    with _mapped(path) as f:
+        yield from ijson.items(f, 'features.item', use_float=True)
+
+def iter_feature_properties(path):
+    """Yield each feature's properties dict, never building the geometries
+    when ijson is available."""
+    if not HAVE_IJSON:
+        for feature in iter_features(path):
+            yield feature.get('properties', {})
+        return
+    with _mapped(path) as f:
+        yield from ijson.items(f, 'features.item.properties', use_float=True)
+
+def normalize_county(name):
+    """Canonical county key: 'Harris County ' / 'HARRIS' -> 'harris'."""
+    name = name.strip().lower()
+    if name.endswith(' county'):
+        name = name[:-len(' county')].rstrip()
+    return name
+
+@lru_cache(maxsize=2)
+def _ercot_by_name(path):
+    by_name = {}
+    for props in iter_feature_properties(path):
+        # First feature with a given NAME wins
+        by_name.setdefault(props.get('NAME', '').strip(), props)
+    return by_name
+
+def load_ercot_by_name(path):
+    """County NAME -> properties for an aggregated ERCOT counties file."""
+    return _ercot_by_name(str(path))
+
+def get_county(path, name):
+    """Properties of county `name` in the aggregated ERCOT file, or None."""
+    return load_ercot_by_name(path).get(name)
+
+def _project_row(props):
+    return {
+        'name': props.get('Project Name', 'N/A'),
+        'fuel': props.get('Fuel', 'N/A'),
+        'capacity': props.get('Capacity (MW)', 0),
+        'cod': props.get('Projected COD', ''),
+        'status': props.get('GIM Study Phase', '')
+    }
+
+@lru_cache(maxsize=1)
+def _projects_by_county(path):
+    idx = defaultdict(list)
+    for props in iter_feature_properties(path):
+        county = normalize_county(props.get('County') or '')
+        if county:
+            idx[county].append(_project_row(props))
+    return dict(idx)
+
+def load_projects_by_county(path):
+    """Index the ERCOT GIS report projects by normalized county name."""
+    return _projects_by_county(str(path))
+
+def _source_key(path):
+    stat = Path(path).stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+def cached_pickle(source_path, cache_name, build_fn):
+    """build_fn()'s result for the file at `source_path`, memoized on disk.
+    
+    The value is pickled to data/cache/<source stem>.<cache_name>.pkl with
+    the source's mtime and size, and reused until either changes. A cache
+    that can't be read or written is just rebuilt or skipped.
+    """
+    cache_path = CACHE_ROOT / f'{Path(source_path).stem}.{cache_name}.pkl'
+    key = _source_key(source_path)
+    try:
+        cached = pickle.loads(cache_path.read_bytes())
+        if cached['source'] == key:
+            return cached['value']
+    except Exception:
+        pass
+    
+    value = build_fn()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(pickle.dumps({'source': key, 'value': value}, protocol=5))
+    except OSError:
+        pass
+    return value
+
+def county_shard_dir(path):
+    """Where build_county_shards puts the sidecars for the report at `path`."""
+    return SHARD_ROOT / Path(path).stem
+
+def _shard_name(county):
+    return county.replace('/', '_') + '.jsonl'
+
+def build_county_shards(path):
+    """Split the GIS report into one JSONL file of properties per county.
+    
+    The source stamp is written last, so an interrupted build is never
+    mistaken for a current one. Returns {county: project count}.
+    """
+    groups = defaultdict(list)
+    for props in iter_feature_properties(path):
+        county = normalize_county(props.get('County') or '')
+        if county:
+            groups[county].append(props)
+    
+    shard_dir = county_shard_dir(path)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    stamp = shard_dir / '_source.json'
+    stamp.unlink(missing_ok=True)
+    for old in shard_dir.glob('*.jsonl'):
+        old.unlink()
+    for county, rows in groups.items():
+        (shard_dir / _shard_name(county)).write_bytes(
+            b''.join(dumps_json(props) + b'\n' for props in rows))
+    stamp.write_bytes(dumps_json(_source_key(path)))
+    return {county: len(rows) for county, rows in groups.items()}
+
+def load_county_projects(path, county):
+    """Projects in `county` from the GIS report at `path`.
+    
+    Reads just that county's shard when build_ercot_shards.py has been run
+    against the current file; otherwise falls back to the full-file index.
+    """
+    key = normalize_county(county)
+    shard_dir = county_shard_dir(path)
+    try:
+        current = loads_json((shard_dir / '_source.json').read_bytes()) == _source_key(path)
+    except (OSError, ValueError):
+        current = False
+    if not current:
+        return load_projects_by_county(path).get(key, [])
+    
+    shard = shard_dir / _shard_name(key)
+    if not shard.exists():
+        return []
+    with open(shard, 'rb') as f:
+        return [_project_row(loads_json(line)) for line in f]
+
+def projection_path(path):
+    """Where build_projection puts the projected copy of `path`."""
+    return PROJECTION_ROOT / f'{Path(path).stem}.json'
+
+def _project_feature(feature, fields, geometry):
+    slim = {}
+    if 'properties' in feature:
+        props = feature['properties']
+        slim['properties'] = {k: props[k] for k in fields if k in props} if isinstance(props, dict) else props
+    if geometry and 'geometry' in feature:
+        slim['geometry'] = feature['geometry']
+    return slim
+
+def build_projection(path, fields, geometry=False):
+    """Write a copy of the GeoJSON at `path` keeping only `fields` of each
+    feature's properties (and the geometry if asked). Returns the feature
+    count."""
+    fields = sorted(set(fields))
+    features = [_project_feature(feature, fields, geometry) for feature in iter_features(path)]
+    out = projection_path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_bytes(dumps_json({
+        'source': _source_key(path),
+        'fields': fields,
+        'geometry': geometry,
+        'features': features,
+    }))
+    return len(features)
+
+def _current_projection(path, fields, geometry):
+    """The projection of `path` if it is current and covers the request."""
+    try:
+        projection = load_json(projection_path(path))
+        if (projection['source'] == _source_key(path)
+                and set(fields) <= set(projection['fields'])
+                and (projection['geometry'] or not geometry)):
+            return projection
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def iter_projected_features(path, fields, geometry=False):
+    """Features of `path` with at least `fields` in their properties.
+    
+    Reads the projection from build_geojson_projections.py in one go when it
+    is current and covers the request; otherwise streams the full file.
+    """
+    projection = _current_projection(path, fields, geometry)
+    if projection is None:
+        yield from iter_features(path)
+        return
+    yield from projection['features']
+
+def iter_projected_properties(path, fields):
+    """iter_feature_properties, read from the projection when it covers
+    `fields`."""
+    projection = _current_projection(path, fields, False)
+    if projection is None:
+        yield from iter_feature_properties(path)
+        return
+    for feature in projection['features']:
+        if 'properties' in feature:
+            yield feature['properties']
@@ -0,0 +1,11 @@
+"""
+Puts scripts/ on sys.path, so the scripts in this directory can import the
+helpers shared with the top-level scripts (_jsonio). Import it before them.
+"""
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
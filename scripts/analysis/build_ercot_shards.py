@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Split ercot_gis_reports.geojson into per-county JSONL sidecars.
+
+County scripts (e.g. story1_harris_county_profile.py) then read only their
+county's shard instead of parsing the statewide report. Re-run after the
+report is refreshed; stale shards are ignored until then.
+"""
+import sys
+from pathlib import Path
+
+from _ercot_cache import build_county_shards, county_shard_dir
+
+def main():
+    base_path = Path(__file__).parent.parent.parent
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else base_path / 'public/data/ercot/ercot_gis_reports.geojson'
+    if not source.exists():
+        print(f"❌ {source} not found")
+        return 1
+    
+    counts = build_county_shards(source)
+    print(f"✅ Wrote {len(counts)} county shards ({sum(counts.values()):,} projects) to {county_shard_dir(source)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
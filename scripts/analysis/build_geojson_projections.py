@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Write field-projected copies of the DC and ERCOT county GeoJSONs.
+
+story1_power_demand_gap.py and story1_status_breakdown.py only read a few
+properties per feature; with the projections in place they load those
+instead of parsing every feature in full. Re-run after the inputs are
+refreshed; stale projections are ignored until then.
+"""
+from pathlib import Path
+
+from _ercot_cache import DC_FIELDS, ERCOT_COUNTY_FIELDS, build_projection, projection_path
+
+def main():
+    base_path = Path(__file__).parent.parent.parent
+    inputs = [
+        (base_path / 'public/data/texas_data_centers.geojson', DC_FIELDS, True),
+        (base_path / 'public/data/ercot/ercot_counties_aggregated_fixed.geojson', ERCOT_COUNTY_FIELDS, False),
+        (base_path / 'public/data/ercot/ercot_counties_aggregated.geojson', ERCOT_COUNTY_FIELDS, False),
+    ]
+    for source, fields, geometry in inputs:
+        if not source.exists():
+            print(f"⚠️  {source} not found, skipping")
+            continue
+        count = build_projection(source, fields, geometry=geometry)
+        out = projection_path(source)
+        print(f"✅ {source.name}: {count:,} features, "
+              f"{source.stat().st_size / 1e6:.1f} MB -> {out.stat().st_size / 1e6:.1f} MB ({out})")
+
+if __name__ == '__main__':
+    main()
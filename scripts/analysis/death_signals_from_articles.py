@@ -3,9 +3,14 @@
 Death Signals Analysis - Find projects with negative news signals
 """
 
+import hashlib
+import os
+import re
 import sqlite3
 import json
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 
 # Death signal keywords
@@ -19,21 +24,166 @@ DEATH_SIGNALS = {
     'sold': ['land sold', 'site sold', 'property sold']
 }
 
+def _trie_pattern(keywords):
+    """
+    Build a prefix-factored regex for a set of byte keywords, e.g.
+    cancel(?:lation|led) instead of cancelled|cancellation. The regex engine
+    then walks each shared prefix once instead of retrying every keyword.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for byte in keyword:
+            node = node.setdefault(byte, {})
+        node[None] = True
+    
+    def emit(node):
+        alternatives = [
+            re.escape(bytes([byte])) + emit(child)
+            for byte, child in sorted((k, v) for k, v in node.items() if k is not None)
+        ]
+        if not alternatives:
+            return b''
+        if len(alternatives) == 1 and None not in node:
+            return alternatives[0]
+        return b'(?:' + b'|'.join(alternatives) + b')' + (b'?' if None in node else b'')
+    
+    return emit(trie)
+
+# All keywords are ASCII, so they are matched against lowercased UTF-8 bytes.
+# Every keyword is folded into one alternation with a named group per
+# category (each a prefix trie, built once at import); the zero-width
+# lookahead lets overlapping keywords from different categories
+# (e.g. "permit denied" / "denied") each be reported.
+DEATH_SIGNALS_PATTERN = re.compile(
+    b'(?=' + b'|'.join(
+        b'(?P<' + category.encode('ascii') + b'>' +
+        _trie_pattern(keyword.encode('ascii') for keyword in keywords) + b')'
+        for category, keywords in DEATH_SIGNALS.items()
+    ) + b')'
+)
+
 def find_death_signals_in_text(text):
-    """Find death signals in article text"""
+    """Find death signals in article text (str or UTF-8 bytes)"""
     if not text:
         return []
     
-    text_lower = text.lower()
-    found_signals = []
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    
+    found = set()
+    for match in DEATH_SIGNALS_PATTERN.finditer(text.lower()):
+        found.add(match.lastgroup)
+        if len(found) == len(DEATH_SIGNALS):
+            break
+    
+    # Only count each category once per article, in DEATH_SIGNALS order
+    return [category for category in DEATH_SIGNALS if category in found]
+
+# Rows per worker task when scanning articles in parallel
+SCAN_CHUNK_SIZE = 2000
+
+# Keys every content hash, so editing DEATH_SIGNALS invalidates the
+# cached scan results of unchanged articles too
+DEATH_SIGNALS_DIGEST = hashlib.blake2b(repr(DEATH_SIGNALS).encode('utf-8'), digest_size=16).digest()
+
+def content_hash(full_text):
+    """Short digest of an article's combined text and the keyword table,
+    used to detect when a cached scan result is stale"""
+    return hashlib.blake2b(full_text, digest_size=8, key=DEATH_SIGNALS_DIGEST).hexdigest()
+
+def ensure_signal_cache(conn):
+    """Create the per-mention scan results table (older DBs predate it)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mention_signals (
+            mention_id TEXT PRIMARY KEY,
+            signals TEXT,
+            content_hash TEXT
+        )
+    """)
+    conn.commit()
+
+def load_signal_cache(conn):
+    """mention_id -> (content_hash, signals list) from previous runs"""
+    cache = {}
+    for mention_id, signals_json, digest in conn.execute(
+        "SELECT mention_id, signals, content_hash FROM mention_signals"
+    ):
+        try:
+            cache[mention_id] = (digest, json.loads(signals_json))
+        except (TypeError, ValueError):
+            continue
+    return cache
+
+def new_death_mentions():
+    """
+    Death mentions are kept as parallel lists (one per field) rather than one
+    dict per article; entry i of each list describes the same article.
+    """
+    return {'mention_id': [], 'title': [], 'url': [], 'published_at': [], 'signals': []}
+
+def scan_mentions_chunk(rows, cache):
+    """
+    Scan a chunk of mention rows, reusing cached signals for articles whose
+    content hash is unchanged. Returns (row count, death mentions, cache updates).
+    """
+    death_mentions = new_death_mentions()
+    updates = []
+    for mention_id, title, raw_text, snippet, url, published_at in rows:
+        # Combine all text fields
+        full_text = b' '.join(filter(None, [title.encode('utf-8') if title else b'', raw_text, snippet]))
+        digest = content_hash(full_text)
+        
+        cached = cache.get(mention_id)
+        if cached and cached[0] == digest:
+            signals = cached[1]
+        else:
+            # Find signals
+            signals = find_death_signals_in_text(full_text)
+            updates.append((mention_id, json.dumps(signals), digest))
+        
+        if signals:
+            death_mentions['mention_id'].append(mention_id)
+            death_mentions['title'].append(title)
+            death_mentions['url'].append(url)
+            death_mentions['published_at'].append(published_at)
+            death_mentions['signals'].append(signals)
+    return len(rows), death_mentions, updates
+
+def scan_mentions_parallel(cursor, cache=None, max_workers=None):
+    """
+    Fan the article scan out across processes, SCAN_CHUNK_SIZE rows at a time.
+    Only a bounded window of chunks is in flight so the cursor is still
+    consumed incrementally; results come back in cursor order.
+    """
+    cache = cache or {}
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = iter(lambda: list(islice(cursor, SCAN_CHUNK_SIZE)), [])
+    
+    total_mentions = 0
+    death_mentions = new_death_mentions()
+    cache_updates = []
+    
+    def collect(future):
+        nonlocal total_mentions
+        count, found, updates = future.result()
+        total_mentions += count
+        for field, values in found.items():
+            death_mentions[field].extend(values)
+        cache_updates.extend(updates)
     
-    for category, keywords in DEATH_SIGNALS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                found_signals.append(category)
-                break  # Only count each category once per article
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            # Ship only the cache entries this chunk can use
+            chunk_cache = {row[0]: cache[row[0]] for row in chunk if row[0] in cache}
+            pending.append(executor.submit(scan_mentions_chunk, chunk, chunk_cache))
+            if len(pending) >= max_workers * 2:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
     
-    return found_signals
+    return total_mentions, death_mentions, cache_updates
 
 def main():
     base_path = Path(__file__).parent.parent.parent
@@ -52,48 +202,37 @@ def main():
     print("=" * 80)
     print()
     
-    # Get all mentions with text
+    # Get all mentions with text (body fields as bytes to skip str decoding)
     cursor.execute("""
-        SELECT mention_id, title, raw_text, snippet, url, published_at
+        SELECT mention_id, title, CAST(raw_text AS BLOB), CAST(snippet AS BLOB), url, published_at
         FROM mentions
     """)
     
-    mentions = cursor.fetchall()
+    # Only articles that are new or changed since the last run get rescanned
+    ensure_signal_cache(conn)
+    cache = load_signal_cache(conn)
     
-    print(f"📊 Total articles in database: {len(mentions)}")
-    print()
+    # Iterate the cursor directly rather than materializing every row
+    total_mentions, death_mentions, cache_updates = scan_mentions_parallel(cursor, cache)
     
-    # Find death signals in articles
-    death_mentions = []
+    if cache_updates:
+        cursor.executemany(
+            "INSERT OR REPLACE INTO mention_signals (mention_id, signals, content_hash) VALUES (?, ?, ?)",
+            cache_updates
+        )
+        conn.commit()
     
-    for mention in mentions:
-        mention_id, title, raw_text, snippet, url, published_at = mention
-        
-        # Combine all text fields
-        full_text = ' '.join(filter(None, [title or '', raw_text or '', snippet or '']))
-        
-        # Find signals
-        signals = find_death_signals_in_text(full_text)
-        
-        if signals:
-            death_mentions.append({
-                'mention_id': mention_id,
-                'title': title,
-                'url': url,
-                'published_at': published_at,
-                'signals': signals
-            })
+    print(f"📊 Total articles in database: {total_mentions}")
+    print()
     
-    print(f"🔍 Found {len(death_mentions)} articles with death signals (out of {len(mentions)} total)")
-    if len(mentions) > 0:
-        print(f"   Percentage with negative signals: {len(death_mentions)/len(mentions)*100:.1f}%")
+    death_count = len(death_mentions['mention_id'])
+    print(f"🔍 Found {death_count} articles with death signals (out of {total_mentions} total)")
+    if total_mentions > 0:
+        print(f"   Percentage with negative signals: {death_count/total_mentions*100:.1f}%")
     print()
     
     # Count signal types
-    signal_counts = Counter()
-    for death_mention in death_mentions:
-        for signal in death_mention['signals']:
-            signal_counts[signal] += 1
+    signal_counts = Counter(chain.from_iterable(death_mentions['signals']))
     
     print("=" * 80)
     print("MOST COMMON DEATH SIGNALS")
@@ -106,15 +245,15 @@ def main():
     print()
     
     # Show sample death articles
-    if death_mentions:
+    if death_count:
         print("=" * 80)
         print("SAMPLE ARTICLES WITH DEATH SIGNALS (first 10)")
         print("=" * 80)
-        for article in death_mentions[:10]:
-            print(f"\n📰 {article['title']}")
-            print(f"   Signals: {', '.join(article['signals'])}")
-            print(f"   URL: {article['url']}")
-            print(f"   Published: {article['published_at']}")
+        for i in range(min(death_count, 10)):
+            print(f"\n📰 {death_mentions['title'][i]}")
+            print(f"   Signals: {', '.join(death_mentions['signals'][i])}")
+            print(f"   URL: {death_mentions['url'][i]}")
+            print(f"   Published: {death_mentions['published_at'][i]}")
         print()
     
     # Map to projects
@@ -130,6 +269,9 @@ def main():
     
     projects_with_death_signals = []
     
+    # mention_id -> position in the death_mentions lists
+    death_index = {mention_id: i for i, mention_id in enumerate(death_mentions['mention_id'])}
+    
     for project in projects:
         project_id, name, company, location, mention_ids_json = project
         
@@ -146,15 +288,21 @@ def main():
         death_article_count = 0
         death_article_details = []
         
-        for death_mention in death_mentions:
-            if death_mention['mention_id'] in mention_ids:
-                death_article_count += 1
-                project_signals.extend(death_mention['signals'])
-                death_article_details.append({
-                    'title': death_mention['title'],
-                    'url': death_mention['url'],
-                    'signals': death_mention['signals']
-                })
+        if isinstance(mention_ids, str):
+            mention_ids = [mention_ids]
+        matched = sorted({
+            death_index[mid] for mid in mention_ids
+            if isinstance(mid, (str, int)) and mid in death_index
+        })
+        
+        for i in matched:
+            death_article_count += 1
+            project_signals.extend(death_mentions['signals'][i])
+            death_article_details.append({
+                'title': death_mentions['title'][i],
+                'url': death_mentions['url'][i],
+                'signals': death_mentions['signals'][i]
+            })
         
         if death_article_count > 0:
             projects_with_death_signals.append({
@@ -197,10 +345,7 @@ def main():
     
     # Geographic analysis
     if projects_with_death_signals:
-        location_failures = Counter()
-        for proj in projects_with_death_signals:
-            location = proj['location'] or 'Unknown'
-            location_failures[location] += 1
+        location_failures = Counter(proj['location'] or 'Unknown' for proj in projects_with_death_signals)
         
         print("=" * 80)
         print("FAILURES BY LOCATION")
@@ -212,18 +357,9 @@ def main():
     
     # Company analysis
     if projects_with_death_signals:
-        company_failures = Counter()
-        company_total_projects = Counter()
-        
-        # Count total projects per company
-        for project in projects:
-            company = project[2] or 'Unknown'
-            company_total_projects[company] += 1
-        
-        # Count failures per company
-        for proj in projects_with_death_signals:
-            company = proj['company'] or 'Unknown'
-            company_failures[company] += 1
+        # Count total projects and failures per company
+        company_total_projects = Counter(project[2] or 'Unknown' for project in projects)
+        company_failures = Counter(proj['company'] or 'Unknown' for proj in projects_with_death_signals)
         
         print("=" * 80)
         print("FAILURES BY COMPANY")
@@ -242,8 +378,8 @@ def main():
     print("=" * 80)
     print("SUMMARY STATISTICS")
     print("=" * 80)
-    print(f"Total articles analyzed: {len(mentions)}")
-    print(f"Articles with death signals: {len(death_mentions)}")
+    print(f"Total articles analyzed: {total_mentions}")
+    print(f"Articles with death signals: {death_count}")
     print(f"Total projects: {len(projects)}")
     print(f"Projects with death signals: {len(projects_with_death_signals)}")
     if len(projects) > 0:
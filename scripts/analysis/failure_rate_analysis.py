@@ -13,8 +13,9 @@ Implements the 6-step test:
 Outputs human-readable results to stdout.
 """
 
-import json
 import sqlite3
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
 
@@ -28,6 +29,51 @@ def connect_db():
   return sqlite3.connect(str(DB_PATH))
 
 
+def apply_read_pragmas(conn):
+  """
+  Tune SQLite for the read-only analytical scans below: memory-map the DB
+  file, enlarge the page cache and keep temp tables in memory.
+  """
+  conn.executescript(
+    """
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-131072;
+    PRAGMA temp_store=MEMORY;
+    """
+  )
+
+
+def build_project_timeline(conn):
+  """
+  Materialize projects LEFT JOIN project_status once into a temp table.
+  Steps 2, 3, 5 and 6 all read from it instead of re-running the join and
+  re-evaluating the 12-month silence rule.
+  """
+  conn.executescript(
+    """
+    DROP TABLE IF EXISTS temp.project_timeline;
+    CREATE TEMP TABLE project_timeline AS
+    SELECT
+        p.project_id,
+        p.project_name,
+        p.company,
+        p.location_text,
+        p.announced_date,
+        ps.status_current,
+        ps.last_signal_at,
+        julianday('now') - julianday(ps.last_signal_at) as days_since_signal,
+        CASE
+          WHEN ps.last_signal_at IS NOT NULL
+               AND julianday('now') - julianday(ps.last_signal_at) > 365
+          THEN 1
+          ELSE 0
+        END as is_dead
+    FROM projects p
+    LEFT JOIN project_status ps ON p.project_id = ps.project_id;
+    """
+  )
+
+
 def step1_status_breakdown(conn):
   print("=" * 80)
   print("STEP 1: STATUS BREAKDOWN (RAW project_status TABLE)")
@@ -64,37 +110,16 @@ def step2_time_reclassification(conn):
   cursor = conn.cursor()
   cursor.execute(
     """
-    SELECT 
-        p.project_id,
-        p.project_name,
-        p.company,
-        p.location_text,
-        p.announced_date,
-        ps.status_current,
-        ps.last_signal_at,
-        julianday('now') - julianday(ps.last_signal_at) as days_since_signal
-    FROM projects p
-    LEFT JOIN project_status ps ON p.project_id = ps.project_id
+    SELECT
+        SUM(CASE WHEN days_since_signal > 365 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN days_since_signal > 180 AND days_since_signal <= 365 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN days_since_signal <= 180 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN days_since_signal IS NULL THEN 1 ELSE 0 END)
+    FROM project_timeline
     """
   )
 
-  projects = cursor.fetchall()
-
-  dead_count = 0
-  stalled_count = 0
-  active_count = 0
-  never_updated = 0
-
-  for proj in projects:
-    days_since = proj[7]
-    if days_since is None:
-      never_updated += 1
-    elif days_since > 365:
-      dead_count += 1
-    elif days_since > 180:
-      stalled_count += 1
-    else:
-      active_count += 1
+  dead_count, stalled_count, active_count, never_updated = (v or 0 for v in cursor.fetchone())
 
   print("Reclassified by time since last signal:")
   print(f"  Dead (12+ months no updates): {dead_count}")
@@ -114,31 +139,13 @@ def step3_geographic_failure(conn):
   cursor.execute(
     """
     SELECT 
-        p.location_text,
+        location_text,
         COUNT(*) as total_projects,
-        SUM(
-          CASE 
-            WHEN ps.last_signal_at IS NOT NULL 
-                 AND julianday('now') - julianday(ps.last_signal_at) > 365 
-            THEN 1 
-            ELSE 0 
-          END
-        ) as dead_projects,
-        ROUND(
-          SUM(
-            CASE 
-              WHEN ps.last_signal_at IS NOT NULL 
-                   AND julianday('now') - julianday(ps.last_signal_at) > 365 
-              THEN 1 
-              ELSE 0 
-            END
-          ) * 100.0 / COUNT(*),
-          1
-        ) as failure_rate
-    FROM projects p
-    LEFT JOIN project_status ps ON p.project_id = ps.project_id
-    WHERE p.location_text IS NOT NULL
-    GROUP BY p.location_text
+        SUM(is_dead) as dead_projects,
+        ROUND(SUM(is_dead) * 100.0 / COUNT(*), 1) as failure_rate
+    FROM project_timeline
+    WHERE location_text IS NOT NULL
+    GROUP BY location_text
     HAVING total_projects >= 2
     ORDER BY failure_rate DESC, total_projects DESC
     """
@@ -155,6 +162,68 @@ def step3_geographic_failure(conn):
   print()
 
 
+DEAD_OR_CANDIDATE_FILTER = """
+      (ps.last_signal_at IS NOT NULL 
+       AND julianday('now') - julianday(ps.last_signal_at) > 365)
+      OR ps.status_current = 'dead_candidate'
+"""
+
+
+def recent_history_entries(conn, limit=2):
+  """
+  Unnest status_history with json_each and rank entries per project inside
+  SQLite, returning {project_id: [(ts, status, note), ...]} for the `limit`
+  most recent entries of each dead / candidate project.
+  """
+  cursor = conn.cursor()
+  cursor.execute(
+    f"""
+    WITH entries AS (
+      SELECT
+          ps.project_id,
+          je.key AS pos,
+          COALESCE(
+            NULLIF(json_extract(je.value, '$.updated_at'), ''),
+            NULLIF(json_extract(je.value, '$.timestamp'), '')
+          ) AS ts,
+          COALESCE(
+            NULLIF(json_extract(je.value, '$.status'), ''),
+            json_extract(je.value, '$.status_current')
+          ) AS st,
+          COALESCE(
+            NULLIF(json_extract(je.value, '$.note'), ''),
+            NULLIF(json_extract(je.value, '$.reason'), ''),
+            ''
+          ) AS note
+      FROM project_status ps
+      JOIN json_each(ps.status_history) je
+      WHERE ({DEAD_OR_CANDIDATE_FILTER})
+        AND json_valid(ps.status_history)
+        AND json_type(ps.status_history) = 'array'
+    ),
+    ranked AS (
+      SELECT
+          project_id, ts, st, note,
+          ROW_NUMBER() OVER (
+            PARTITION BY project_id
+            ORDER BY COALESCE(ts, '') DESC, pos
+          ) AS rn
+      FROM entries
+    )
+    SELECT project_id, ts, st, note
+    FROM ranked
+    WHERE rn <= ?
+    ORDER BY project_id, rn
+    """,
+    (limit,),
+  )
+
+  return {
+    project_id: [row[1:] for row in rows]
+    for project_id, rows in groupby(cursor, key=itemgetter(0))
+  }
+
+
 def step4_death_signals(conn):
   print("=" * 80)
   print("STEP 4: DEATH SIGNALS FOR DEAD / STALLED PROJECTS")
@@ -163,20 +232,23 @@ def step4_death_signals(conn):
 
   cursor = conn.cursor()
   cursor.execute(
-    """
+    f"""
     SELECT 
+        p.project_id,
         p.project_name,
         p.company,
         p.location_text,
-        ps.status_history,
+        CASE
+          WHEN ps.status_history IS NULL OR ps.status_history = '' THEN 'missing'
+          WHEN NOT json_valid(ps.status_history) THEN 'invalid'
+          WHEN json_type(ps.status_history) != 'array' THEN 'not_list'
+          ELSE 'ok'
+        END as history_state,
         ps.status_current,
         ps.last_signal_at
     FROM projects p
     JOIN project_status ps ON p.project_id = ps.project_id
-    WHERE 
-      (ps.last_signal_at IS NOT NULL 
-       AND julianday('now') - julianday(ps.last_signal_at) > 365)
-      OR ps.status_current = 'dead_candidate'
+    WHERE {DEAD_OR_CANDIDATE_FILTER}
     """
   )
 
@@ -187,42 +259,56 @@ def step4_death_signals(conn):
     print()
     return
 
-  for name, company, location_text, status_history, status_current, last_signal_at in dead_projects:
+  # status_history is typically a list of entries (status, timestamp, signals/notes)
+  # Print a couple of most recent entries
+  recent_by_project = recent_history_entries(conn)
+
+  for project_id, name, company, location_text, history_state, status_current, last_signal_at in dead_projects:
     print(f"{name or 'Unknown Project'} ({company or 'Unknown Company'}, {location_text or 'Unknown Location'})")
     print(f"  status_current: {status_current}, last_signal_at: {last_signal_at}")
-    if not status_history:
+    if history_state == "missing":
       print("  (no status_history JSON)")
-      print()
-      continue
-
-    try:
-      history_data = json.loads(status_history)
-    except Exception:
+    elif history_state == "invalid":
       print("  (invalid status_history JSON)")
-      print()
-      continue
-
-    # status_history is typically a list of entries (status, timestamp, signals/notes)
-    # Print a couple of most recent entries
-    if isinstance(history_data, list):
-      recent = sorted(
-        history_data,
-        key=lambda h: h.get("updated_at") or h.get("timestamp") or "",
-        reverse=True,
-      )[:2]
-      for entry in recent:
-        st = entry.get("status") or entry.get("status_current")
-        ts = entry.get("updated_at") or entry.get("timestamp")
-        note = entry.get("note") or entry.get("reason") or ""
-        print(f"  - {ts}: {st} ({note})")
-    else:
+    elif history_state == "not_list":
       print("  (status_history not in expected list format)")
+    else:
+      for ts, st, note in recent_by_project.get(project_id, []):
+        print(f"  - {ts}: {st} ({note})")
     print()
 
 
+def _parse_date_fast(d):
+  """
+  Slice-and-int parse for the common "YYYY-MM-DD" and
+  "YYYY-MM-DD[ T]HH:MM:SS" shapes. Returns None when d has another shape.
+  """
+  n = len(d)
+  if n not in (10, 19) or d[4] != "-" or d[7] != "-":
+    return None
+  if n == 19 and (d[10] not in " T" or d[13] != ":" or d[16] != ":"):
+    return None
+  digits = d[0:4] + d[5:7] + d[8:10] + (d[11:13] + d[14:16] + d[17:19] if n == 19 else "")
+  if not (digits.isascii() and digits.isdigit()):
+    return None
+  try:
+    if n == 10:
+      return datetime(int(d[0:4]), int(d[5:7]), int(d[8:10]))
+    return datetime(
+      int(d[0:4]), int(d[5:7]), int(d[8:10]),
+      int(d[11:13]), int(d[14:16]), int(d[17:19]),
+    )
+  except ValueError:
+    return None
+
+
 def parse_date_safe(d):
   if not d:
     return None
+  if isinstance(d, str):
+    parsed = _parse_date_fast(d)
+    if parsed is not None:
+      return parsed
   try:
     # Try common formats
     for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ"):
@@ -245,16 +331,13 @@ def step5_timeline_to_death(conn):
   cursor.execute(
     """
     SELECT 
-        p.project_name,
-        p.announced_date,
-        ps.last_signal_at,
-        julianday(ps.last_signal_at) - julianday(p.announced_date) as days_to_death
-    FROM projects p
-    JOIN project_status ps ON p.project_id = ps.project_id
-    WHERE 
-      (ps.last_signal_at IS NOT NULL 
-       AND julianday('now') - julianday(ps.last_signal_at) > 365)
-      AND p.announced_date IS NOT NULL
+        project_name,
+        announced_date,
+        last_signal_at,
+        julianday(last_signal_at) - julianday(announced_date) as days_to_death
+    FROM project_timeline
+    WHERE is_dead = 1
+      AND announced_date IS NOT NULL
     ORDER BY days_to_death
     """
   )
@@ -290,31 +373,13 @@ def step6_company_failure_rates(conn):
   cursor.execute(
     """
     SELECT 
-        p.company,
+        company,
         COUNT(*) as total_projects,
-        SUM(
-          CASE 
-            WHEN ps.last_signal_at IS NOT NULL 
-                 AND julianday('now') - julianday(ps.last_signal_at) > 365 
-            THEN 1 
-            ELSE 0 
-          END
-        ) as dead_projects,
-        ROUND(
-          SUM(
-            CASE 
-              WHEN ps.last_signal_at IS NOT NULL 
-                   AND julianday('now') - julianday(ps.last_signal_at) > 365 
-              THEN 1 
-              ELSE 0 
-            END
-          ) * 100.0 / COUNT(*),
-          1
-        ) as failure_rate
-    FROM projects p
-    LEFT JOIN project_status ps ON p.project_id = ps.project_id
-    WHERE p.company IS NOT NULL
-    GROUP BY p.company
+        SUM(is_dead) as dead_projects,
+        ROUND(SUM(is_dead) * 100.0 / COUNT(*), 1) as failure_rate
+    FROM project_timeline
+    WHERE company IS NOT NULL
+    GROUP BY company
     HAVING total_projects >= 2
     ORDER BY failure_rate DESC, total_projects DESC
     """
@@ -334,6 +399,10 @@ def step6_company_failure_rates(conn):
 def main():
   conn = connect_db()
   try:
+    apply_read_pragmas(conn)
+    build_project_timeline(conn)
+    # Temp table setup is done; the steps themselves only read
+    conn.execute("PRAGMA query_only=1")
     step1_status_breakdown(conn)
     step2_time_reclassification(conn)
     step3_geographic_failure(conn)
@@ -8,104 +8,137 @@ This script analyzes counties to identify:
 3. Suggests improvements to the classification logic
 """
 
-import json
+import heapq
+import math
+from operator import itemgetter
 from pathlib import Path
-from collections import defaultdict
 
-# Classification rules (matching ProducerConsumerCountiesLayer.jsx)
-def classify_county(dc_count, energy_gw):
-    """
-    Classify a county based on DC count and energy capacity.
-    Returns: ('category', 'reason')
-    Matches ProducerConsumerCountiesLayer.jsx logic
-    """
-    dc_count = dc_count or 0
-    energy_gw = energy_gw or 0
-    
+import numpy as np
+
+import _paths  # noqa: F401
+from _jsonio import dumps_json, load_json
+
+CATEGORY_ORDER = ('producer', 'producer-leaning', 'hybrid', 'hybrid-leaning', 'consumer', 'unclassified')
+
+# Feature properties read per county, fetched in one call
+COUNTY_PROPERTIES = itemgetter('NAME', 'dc_count', 'total_capacity_mw')
+
+# Classification rules (matching ProducerConsumerCountiesLayer.jsx), precomputed
+# as a (dc bucket, energy bucket) -> category table.
+#
+# Energy buckets (searchsorted side='right' over ENERGY_EDGES):
+#   0: < 0.3 GW   1: 0.3-0.5 GW   2: 0.5-1 GW   3: exactly 1 GW   4: > 1 GW
+ENERGY_EDGES = (0.3, 0.5, 1.0, math.nextafter(1.0, math.inf))
+
+# DC buckets: 0: <= 0, 1: (0, 1], 2: >= 2, 3: (1, 2) (only for fractional counts)
+CATEGORY_LUT = np.array([
+    ('unclassified', 'producer-leaning', 'producer-leaning', 'producer-leaning', 'producer'),
+    ('consumer', 'producer-leaning', 'producer-leaning', 'producer-leaning', 'producer'),
+    ('consumer', 'consumer', 'hybrid-leaning', 'hybrid', 'hybrid'),
+    ('consumer', 'consumer', 'unclassified', 'unclassified', 'unclassified'),
+], dtype=object)
+
+CATEGORY_REASONS = {
     # Pure Producer: high energy (>1GW) AND low DC count (<= 1)
-    if energy_gw > 1 and dc_count <= 1:
-        return ('producer', f'High energy ({energy_gw:.2f} GW) with low DC count ({dc_count})')
-    
+    'producer': 'High energy ({energy_gw:.2f} GW) with low DC count ({dc_count})',
     # Hybrid: high energy (>=1GW) AND high DC count (>= 2)
-    if energy_gw >= 1 and dc_count >= 2:
-        composite_score = dc_count * energy_gw
-        return ('hybrid', f'High energy ({energy_gw:.2f} GW) and DCs ({dc_count}), score: {composite_score:.2f}')
-    
+    'hybrid': 'High energy ({energy_gw:.2f} GW) and DCs ({dc_count}), score: {score:.2f}',
     # Hybrid-leaning: moderate energy (0.5-1GW) with multiple DCs (>= 2)
-    if 0.5 <= energy_gw < 1 and dc_count >= 2:
-        composite_score = dc_count * energy_gw
-        return ('hybrid-leaning', f'Moderate energy ({energy_gw:.2f} GW) with multiple DCs ({dc_count}), score: {composite_score:.2f}')
-    
+    'hybrid-leaning': 'Moderate energy ({energy_gw:.2f} GW) with multiple DCs ({dc_count}), score: {score:.2f}',
     # Producer-leaning: moderate energy (0.3-1GW) with low DC count (<= 1)
-    if 0.3 <= energy_gw <= 1 and dc_count <= 1:
-        return ('producer-leaning', f'Moderate energy ({energy_gw:.2f} GW) with low DC count ({dc_count})')
-    
+    'producer-leaning': 'Moderate energy ({energy_gw:.2f} GW) with low DC count ({dc_count})',
     # Pure Consumer: low energy (<0.5GW) AND high DC count (>0)
-    if energy_gw < 0.5 and dc_count > 0:
-        return ('consumer', f'Low energy ({energy_gw:.2f} GW) with DCs ({dc_count})')
-    
+    'consumer': 'Low energy ({energy_gw:.2f} GW) with DCs ({dc_count})',
     # Default/unclassified
-    return ('unclassified', f'Energy: {energy_gw:.2f} GW, DCs: {dc_count} - falls outside all categories')
+    'unclassified': 'Energy: {energy_gw:.2f} GW, DCs: {dc_count} - falls outside all categories',
+}
 
-def get_color_for_category(category, dc_count, energy_gw):
-    """Get expected color for a category"""
-    if category == 'producer':
-        if energy_gw <= 1:
-            return '#228B22'  # forest green
-        elif energy_gw <= 2:
-            return '#32CD32'  # lime green
-        elif energy_gw <= 3:
-            return '#50C878'  # emerald green
-        elif energy_gw <= 5:
-            return '#00FF7F'  # spring green
-        elif energy_gw <= 7:
-            return '#00FF00'  # bright green
-        else:
-            return '#00AA00'  # dark green
-    elif category == 'consumer':
-        if dc_count <= 1:
-            return '#FFB6C1'  # light pink
-        elif dc_count <= 2:
-            return '#FF6B6B'  # light red
-        elif dc_count <= 3:
-            return '#FF4444'  # medium red
-        elif dc_count <= 5:
-            return '#DC143C'  # crimson
-        elif dc_count <= 8:
-            return '#B22222'  # fire brick
-        elif dc_count <= 10:
-            return '#8B0000'  # dark red
-        else:
-            return '#5C0000'  # very dark red
-    elif category == 'hybrid':
-        composite_score = dc_count * energy_gw
-        if composite_score <= 2:
-            return '#BA55D3'  # medium orchid
-        elif composite_score <= 4:
-            return '#9370DB'  # medium purple
-        elif composite_score <= 6:
-            return '#8B008B'  # dark magenta
-        elif composite_score <= 10:
-            return '#6A0DAD'  # indigo
-        else:
-            return '#4B0082'  # deep indigo
-    elif category == 'hybrid-leaning':
-        composite_score = dc_count * energy_gw
-        if composite_score <= 1:
-            return '#DDA0DD'  # plum
-        elif composite_score <= 2:
-            return '#BA55D3'  # medium orchid
-        else:
-            return '#9370DB'  # medium purple
-    elif category == 'producer-leaning':
-        if energy_gw <= 0.5:
-            return '#90EE90'  # light green
-        elif energy_gw <= 0.75:
-            return '#7CFC00'  # lawn green
-        else:
-            return '#228B22'  # forest green
-    else:
-        return 'transparent'  # unclassified
+# Color ramps per category: value <= edges[i] -> colors[i], above all edges -> colors[-1]
+PRODUCER_ENERGY_EDGES = (1, 2, 3, 5, 7)
+PRODUCER_COLORS = ('#228B22', '#32CD32', '#50C878', '#00FF7F', '#00FF00', '#00AA00')
+CONSUMER_DC_EDGES = (1, 2, 3, 5, 8, 10)
+CONSUMER_COLORS = ('#FFB6C1', '#FF6B6B', '#FF4444', '#DC143C', '#B22222', '#8B0000', '#5C0000')
+HYBRID_SCORE_EDGES = (2, 4, 6, 10)
+HYBRID_COLORS = ('#BA55D3', '#9370DB', '#8B008B', '#6A0DAD', '#4B0082')
+HYBRID_LEANING_SCORE_EDGES = (1, 2)
+HYBRID_LEANING_COLORS = ('#DDA0DD', '#BA55D3', '#9370DB')
+PRODUCER_LEANING_ENERGY_EDGES = (0.5, 0.75)
+PRODUCER_LEANING_COLORS = ('#90EE90', '#7CFC00', '#228B22')
+
+def classify_counties_vectorized(dc_counts, energy_gws):
+    """
+    Classify and color counties over whole arrays (matches
+    ProducerConsumerCountiesLayer.jsx). Returns (categories, colors) as
+    lists aligned with the inputs.
+    """
+    dc = np.asarray(dc_counts, dtype=np.float64)
+    e = np.asarray(energy_gws, dtype=np.float64)
+    score = dc * e
+    
+    # Look every county up in CATEGORY_LUT by its (dc, energy) bucket
+    dc_bucket = np.select([dc <= 0, dc <= 1, dc >= 2], [0, 1, 2], default=3)
+    energy_bucket = np.searchsorted(np.asarray(ENERGY_EDGES), e, side='right')
+    categories = CATEGORY_LUT[dc_bucket, energy_bucket]
+    # NaN fails every threshold comparison
+    categories[np.isnan(dc) | np.isnan(e)] = 'unclassified'
+    
+    colors = np.full(categories.shape, 'transparent', dtype=object)
+    ramps = (
+        ('producer', e, PRODUCER_ENERGY_EDGES, PRODUCER_COLORS),
+        ('consumer', dc, CONSUMER_DC_EDGES, CONSUMER_COLORS),
+        ('hybrid', score, HYBRID_SCORE_EDGES, HYBRID_COLORS),
+        ('hybrid-leaning', score, HYBRID_LEANING_SCORE_EDGES, HYBRID_LEANING_COLORS),
+        ('producer-leaning', e, PRODUCER_LEANING_ENERGY_EDGES, PRODUCER_LEANING_COLORS),
+    )
+    for category, values, edges, palette in ramps:
+        mask = categories == category
+        if mask.any():
+            # side='left' counts edges strictly below the value, i.e. "<= edge" bins
+            bins = np.searchsorted(np.asarray(edges, dtype=np.float64), values[mask], side='left')
+            colors[mask] = np.asarray(palette, dtype=object)[bins]
+    
+    return categories.tolist(), colors.tolist()
+
+def process_chunk(features):
+    """
+    Classify and color a list of county features.
+    Returns the county dicts (features without a NAME are skipped), in order.
+    """
+    rows = []
+    for feature in features:
+        props = feature.get('properties', {})
+        try:
+            county_name, dc_count, total_capacity_mw = COUNTY_PROPERTIES(props)
+        except KeyError:
+            county_name = props.get('NAME', '')
+            dc_count = props.get('dc_count')
+            total_capacity_mw = props.get('total_capacity_mw')
+        county_name = county_name.strip()
+        dc_count = dc_count or 0
+        total_capacity_mw = total_capacity_mw or 0
+        
+        if county_name:
+            rows.append((county_name, dc_count, total_capacity_mw, total_capacity_mw / 1000))
+    
+    # Classify and color every county in one vectorized pass
+    categories, colors = classify_counties_vectorized(
+        [row[1] for row in rows], [row[3] for row in rows]
+    )
+    
+    counties = []
+    for (county_name, dc_count, total_capacity_mw, energy_gw), category, color in zip(rows, categories, colors):
+        counties.append({
+            'name': county_name,
+            'dc_count': dc_count,
+            'energy_gw': energy_gw,
+            'total_capacity_mw': total_capacity_mw,
+            'category': category,
+            'reason': CATEGORY_REASONS[category].format(
+                energy_gw=energy_gw, dc_count=dc_count, score=dc_count * energy_gw
+            ),
+            'color': color
+        })
+    return counties
 
 def main():
     # Load GeoJSON data
@@ -115,43 +148,25 @@ def main():
         print(f"❌ Error: GeoJSON file not found at {geojson_path}")
         return
     
-    with geojson_path.open() as f:
-        data = json.load(f)
-    
-    counties = []
-    for feature in data.get('features', []):
-        props = feature.get('properties', {})
-        county_name = props.get('NAME', '').strip()
-        dc_count = props.get('dc_count', 0) or 0
-        total_capacity_mw = props.get('total_capacity_mw', 0) or 0
-        energy_gw = total_capacity_mw / 1000
-        
-        if county_name:
-            category, reason = classify_county(dc_count, energy_gw)
-            color = get_color_for_category(category, dc_count, energy_gw)
-            
-            counties.append({
-                'name': county_name,
-                'dc_count': dc_count,
-                'energy_gw': energy_gw,
-                'total_capacity_mw': total_capacity_mw,
-                'category': category,
-                'reason': reason,
-                'color': color
-            })
+    data = load_json(geojson_path)
     
-    # Sort by energy GW (descending) for producers, by DC count (descending) for consumers
-    counties.sort(key=lambda x: (
-        x['category'] == 'unclassified',  # Unclassified last
-        -x['energy_gw'] if x['category'] in ['producer', 'hybrid', 'producer-leaning'] else 0,
-        -x['dc_count'] if x['category'] == 'consumer' else 0
-    ))
+    counties = process_chunk(data.get('features', []))
     
-    # Group by category
-    by_category = defaultdict(list)
+    # Group by category (in input order; each report below ranks its own subset)
+    by_category = {category: [] for category in CATEGORY_ORDER}
     for county in counties:
         by_category[county['category']].append(county)
     
+    # Rank each category once; the console shows the first 10, the report keeps 20
+    producers = by_category['producer']
+    consumers = by_category['consumer']
+    hybrids = by_category['hybrid']
+    hybrid_leaning = by_category['hybrid-leaning']
+    top_producers = heapq.nlargest(20, producers, key=itemgetter('energy_gw'))
+    top_consumers = heapq.nlargest(20, consumers, key=itemgetter('dc_count'))
+    top_hybrids = heapq.nlargest(20, hybrids, key=lambda x: (x['dc_count'] * x['energy_gw'], x['energy_gw']))
+    top_hybrid_leaning = heapq.nlargest(10, hybrid_leaning, key=lambda x: x['dc_count'] * x['energy_gw'])
+    
     print("=" * 100)
     print("PRODUCER/CONSUMER COUNTY CLASSIFICATION ANALYSIS")
     print("=" * 100)
@@ -160,7 +175,7 @@ def main():
     # Summary
     print("SUMMARY:")
     print("-" * 100)
-    for category in ['producer', 'producer-leaning', 'hybrid', 'hybrid-leaning', 'consumer', 'unclassified']:
+    for category in CATEGORY_ORDER:
         count = len(by_category[category])
         if count > 0:
             print(f"  {category.upper():20s}: {count:3d} counties")
@@ -176,12 +191,12 @@ def main():
         print("They may need classification rule adjustments.\n")
         
         # Sort unclassified by energy and DC count to see patterns
-        unclassified_sorted = sorted(unclassified, key=lambda x: (-x['energy_gw'], -x['dc_count']))
+        top_unclassified = heapq.nlargest(20, unclassified, key=itemgetter('energy_gw', 'dc_count'))
         
         print(f"{'County':<20} {'Energy (GW)':<15} {'DC Count':<12} {'Suggestion':<50}")
         print("-" * 100)
         
-        for county in unclassified_sorted[:20]:  # Show top 20
+        for county in top_unclassified:  # Show top 20
             suggestion = ""
             if county['energy_gw'] > 0.3 and county['dc_count'] == 0:
                 suggestion = "→ Should be Producer (has energy, no DCs)"
@@ -196,12 +211,11 @@ def main():
             
             print(f"{county['name']:<20} {county['energy_gw']:>12.2f}     {county['dc_count']:>8}     {suggestion}")
         
-        if len(unclassified_sorted) > 20:
-            print(f"\n... and {len(unclassified_sorted) - 20} more unclassified counties")
+        if len(unclassified) > 20:
+            print(f"\n... and {len(unclassified) - 20} more unclassified counties")
         print()
     
     # Producer counties
-    producers = by_category['producer']
     if producers:
         print("=" * 100)
         print(f"🟢 PRODUCER COUNTIES ({len(producers)} counties)")
@@ -209,15 +223,13 @@ def main():
         print("High energy capacity (>1 GW) with low DC count (<= 1)\n")
         
         # Show top 10 producers
-        top_producers = sorted(producers, key=lambda x: -x['energy_gw'])[:10]
         print(f"{'County':<20} {'Energy (GW)':<15} {'DC Count':<12} {'Color':<20}")
         print("-" * 100)
-        for county in top_producers:
+        for county in top_producers[:10]:
             print(f"{county['name']:<20} {county['energy_gw']:>12.2f}     {county['dc_count']:>8}     {county['color']:<20}")
         print()
     
     # Consumer counties
-    consumers = by_category['consumer']
     if consumers:
         print("=" * 100)
         print(f"🔴 CONSUMER COUNTIES ({len(consumers)} counties)")
@@ -225,15 +237,13 @@ def main():
         print("Low energy capacity (<0.5 GW) with data centers\n")
         
         # Show top 10 consumers
-        top_consumers = sorted(consumers, key=lambda x: -x['dc_count'])[:10]
         print(f"{'County':<20} {'Energy (GW)':<15} {'DC Count':<12} {'Color':<20}")
         print("-" * 100)
-        for county in top_consumers:
+        for county in top_consumers[:10]:
             print(f"{county['name']:<20} {county['energy_gw']:>12.2f}     {county['dc_count']:>8}     {county['color']:<20}")
         print()
     
     # Hybrid counties
-    hybrids = by_category['hybrid']
     if hybrids:
         print("=" * 100)
         print(f"🟣 HYBRID COUNTIES ({len(hybrids)} counties)")
@@ -241,16 +251,14 @@ def main():
         print("High energy capacity (>=1 GW) with multiple data centers (>= 2)\n")
         
         # Show top 10 hybrids
-        top_hybrids = sorted(hybrids, key=lambda x: -(x['dc_count'] * x['energy_gw']))[:10]
         print(f"{'County':<20} {'Energy (GW)':<15} {'DC Count':<12} {'Score':<12} {'Color':<20}")
         print("-" * 100)
-        for county in top_hybrids:
+        for county in top_hybrids[:10]:
             score = county['dc_count'] * county['energy_gw']
             print(f"{county['name']:<20} {county['energy_gw']:>12.2f}     {county['dc_count']:>8}     {score:>10.2f}  {county['color']:<20}")
         print()
     
     # Hybrid-leaning counties
-    hybrid_leaning = by_category['hybrid-leaning']
     if hybrid_leaning:
         print("=" * 100)
         print(f"🟣 HYBRID-LEANING COUNTIES ({len(hybrid_leaning)} counties)")
@@ -258,7 +266,6 @@ def main():
         print("Moderate energy capacity (0.5-1 GW) with multiple data centers (>= 2)\n")
         
         # Show top 10 hybrid-leaning
-        top_hybrid_leaning = sorted(hybrid_leaning, key=lambda x: -(x['dc_count'] * x['energy_gw']))[:10]
         print(f"{'County':<20} {'Energy (GW)':<15} {'DC Count':<12} {'Score':<12} {'Color':<20}")
         print("-" * 100)
         for county in top_hybrid_leaning:
@@ -334,14 +341,13 @@ def main():
             'by_category': {cat: len(by_category[cat]) for cat in by_category}
         },
         'unclassified': unclassified,
-        'top_producers': sorted(producers, key=lambda x: -x['energy_gw'])[:20] if producers else [],
-        'top_consumers': sorted(consumers, key=lambda x: -x['dc_count'])[:20] if consumers else [],
-        'top_hybrids': sorted(hybrids, key=lambda x: -(x['dc_count'] * x['energy_gw']))[:20] if hybrids else [],
+        'top_producers': top_producers,
+        'top_consumers': top_consumers,
+        'top_hybrids': top_hybrids,
         'edge_cases': edge_cases[:20]
     }
     
-    with report_path.open('w') as f:
-        json.dump(report, f, indent=2)
+    report_path.write_bytes(dumps_json(report, indent=True))
     
     print(f"4. 📊 Detailed report saved to: {report_path}")
     print()
@@ -12,12 +12,30 @@ Implements the full set of queries described in the instructions:
   7. Compute concentration metrics (50/75/80% thresholds and 80/20 rule)
 """
 
-import json
+from bisect import bisect_left
+from itertools import accumulate
 from pathlib import Path
 from collections import Counter
 
+from _ercot_cache import cached_pickle, iter_features
+
+METRO_DEFINITIONS = {
+  "DFW": ["Dallas", "Tarrant", "Collin", "Denton", "Ellis", "Rockwall", "Kaufman", "Johnson"],
+  "Austin": ["Travis", "Williamson", "Hays", "Bastrop", "Caldwell"],
+  "Houston": ["Harris", "Fort Bend", "Montgomery", "Brazoria", "Galveston", "Liberty", "Chambers", "Waller"],
+  "San Antonio": ["Bexar", "Guadalupe", "Comal", "Wilson", "Medina"],
+}
+ALL_METRO_COUNTIES = frozenset(c for counties in METRO_DEFINITIONS.values() for c in counties)
+COUNTY_TO_METRO = {c: metro for metro, counties in METRO_DEFINITIONS.items() for c in counties}
+
+# Cells per side of the uniform grid used to resolve most points without a contains() call
+COUNTY_GRID_SIZE = 200
+
 try:
-  from shapely.geometry import Point, shape
+  import numpy as np
+  import shapely
+  from shapely.geometry import shape
+  from shapely.strtree import STRtree
   HAVE_SHAPELY = True
 except ImportError:
   HAVE_SHAPELY = False
@@ -27,20 +45,31 @@ def load_texas_data_centers(base_path: Path):
   path = base_path / "public/data/texas_data_centers.geojson"
   if not path.exists():
     raise FileNotFoundError(f"texas_data_centers.geojson not found at {path}")
-  with path.open("r") as f:
-    return json.load(f)
+
+  # Keep only the fields the steps below read
+  features = []
+  for feature in iter_features(path):
+    props = feature.get("properties", {}) or {}
+    geom = feature.get("geometry") or {}
+    features.append({
+      "properties": {k: props[k] for k in ("project_name", "location") if k in props},
+      "geometry": {"coordinates": geom.get("coordinates")} if isinstance(geom, dict) else None,
+    })
+  return {"type": "FeatureCollection", "features": features}
 
 
 def load_ercot_county_polygons(base_path: Path):
   """
   Load ERCOT county polygons and build a mapping:
-    county_name -> shapely shape(geometry)
+    county_name -> shapely shape(geometry), prepared for contains()
 
+  Returns (county_polygons, county_grid), where county_grid is the
+  build_county_grid index over the same polygons (None if none loaded).
   Falls back between aggregated_fixed and aggregated if needed.
   """
   if not HAVE_SHAPELY:
     print("⚠️  shapely not installed - cannot run point-in-polygon county assignment.")
-    return {}
+    return {}, None
 
   geo_path = base_path / "public/data/ercot/ercot_counties_aggregated_fixed.geojson"
   if not geo_path.exists():
@@ -48,26 +77,124 @@ def load_ercot_county_polygons(base_path: Path):
 
   if not geo_path.exists():
     print(f"⚠️  ERCOT counties GeoJSON not found at {geo_path}, skipping county assignment.")
-    return {}
+    return {}, None
 
-  with geo_path.open("r") as f:
-    geojson = json.load(f)
+  def build():
+    county_polygons = {}
+    for feature in iter_features(geo_path):
+      props = feature.get("properties", {}) or {}
+      county_name = props.get("NAME", "").strip()
+      geom = feature.get("geometry")
+      if not county_name or not geom:
+        continue
+      try:
+        county_polygons[county_name] = shape(geom)
+      except Exception:
+        # Skip invalid geometries
+        continue
+    county_grid = build_county_grid(list(county_polygons.values())) if county_polygons else None
+    return county_polygons, county_grid
 
-  county_polygons = {}
-  for feature in geojson.get("features", []):
-    props = feature.get("properties", {}) or {}
-    county_name = props.get("NAME", "").strip()
-    geom = feature.get("geometry")
-    if not county_name or not geom:
-      continue
-    try:
-      county_polygons[county_name] = shape(geom)
-    except Exception:
-      # Skip invalid geometries
-      continue
+  # Parsed polygons and their grid index are cached (pickled WKB and
+  # arrays) keyed on the GeoJSON's mtime and size; bump the version in the
+  # name when build_county_grid changes
+  county_polygons, county_grid = cached_pickle(geo_path, f"polygons.grid{COUNTY_GRID_SIZE}.v2", build)
+
+  # Build GEOS's indexed representation once for repeated contains()
+  # (prepared state is not pickled, so this runs on cache hits too)
+  for poly in county_polygons.values():
+    shapely.prepare(poly)
 
   print(f"Loaded {len(county_polygons)} county polygons from {geo_path.name}")
-  return county_polygons
+  return county_polygons, (county_grid if county_polygons else None)
+
+
+def build_county_grid(polygons, size=COUNTY_GRID_SIZE):
+  """
+  Rasterize county polygons onto a size x size grid over their joint bounds.
+
+  Each cell lists the counties that touch it (ascending index, CSR layout in
+  offsets/candidates). When the lowest-index touching county contains the
+  whole cell, edges included (contains_properly), owner[cell] holds that
+  county and points there need no contains() call, since none of them can
+  lie on the county boundary; otherwise owner[cell] is -1 and the
+  candidates are tested in order, so overlaps resolve to the first county
+  in file order.
+  """
+  bounds = np.array([poly.bounds for poly in polygons], dtype=np.float64)
+  minx, miny = bounds[:, 0].min(), bounds[:, 1].min()
+  maxx, maxy = bounds[:, 2].max(), bounds[:, 3].max()
+  dx = (maxx - minx) / size or 1.0
+  dy = (maxy - miny) / size or 1.0
+
+  # Row-major cells: cell = row * size + col, row along y
+  gx, gy = np.meshgrid(minx + dx * np.arange(size), miny + dy * np.arange(size))
+  cell_tree = STRtree(shapely.box(gx, gy, gx + dx, gy + dy).ravel())
+  touch_county, touch_cell = cell_tree.query(polygons, predicate="intersects")
+  full_county, full_cell = cell_tree.query(polygons, predicate="contains_properly")
+
+  order = np.lexsort((touch_county, touch_cell))
+  touch_cell = touch_cell[order]
+  touch_county = touch_county[order]
+  n_cells = size * size
+  offsets = np.zeros(n_cells + 1, dtype=np.int64)
+  offsets[1:] = np.cumsum(np.bincount(touch_cell, minlength=n_cells))
+
+  owner = np.full(n_cells, -1, dtype=np.int64)
+  touched = np.flatnonzero(offsets[1:] > offsets[:-1])
+  first_county = touch_county[offsets[touched]]
+  n_counties = len(polygons)
+  is_full = np.isin(touched * n_counties + first_county, full_cell * n_counties + full_county)
+  owner[touched[is_full]] = first_county[is_full]
+
+  return {
+    "size": size,
+    "origin": (float(minx), float(miny)),
+    "cell": (float(dx), float(dy)),
+    "owner": owner,
+    "offsets": offsets,
+    "candidates": touch_county.astype(np.int64),
+  }
+
+
+def lookup_county_grid(county_grid, polygons, xs, ys):
+  """
+  Resolve county indices for coordinate arrays through a build_county_grid
+  index. Returns an int array with -1 for points outside every county.
+  """
+  size = county_grid["size"]
+  x0, y0 = county_grid["origin"]
+  dx, dy = county_grid["cell"]
+  fx = (xs - x0) / dx
+  fy = (ys - y0) / dy
+  in_grid = (fx >= 0) & (fx <= size) & (fy >= 0) & (fy <= size)
+  # The max edge belongs to the last cell; off-grid (and NaN) points park in cell 0
+  cols = np.clip(np.where(in_grid, fx, 0), 0, size - 1).astype(np.int64)
+  rows = np.clip(np.where(in_grid, fy, 0), 0, size - 1).astype(np.int64)
+  cells = rows * size + cols
+  hits = np.where(in_grid, county_grid["owner"][cells], -1)
+
+  # Only points in partially covered cells reach contains(): one vectorized
+  # call over every (point, candidate county) pair
+  pending = np.flatnonzero(in_grid & (hits < 0))
+  offsets = county_grid["offsets"]
+  starts = offsets[cells[pending]]
+  counts = offsets[cells[pending] + 1] - starts
+  if counts.sum() == 0:
+    return hits
+  pair_point = np.repeat(pending, counts)
+  pair_slot = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+  pair_county = county_grid["candidates"][pair_slot]
+  inside = shapely.contains_xy(
+    np.asarray(polygons, dtype=object)[pair_county], xs[pair_point], ys[pair_point]
+  )
+
+  # Lowest containing county index per point
+  first = np.full(hits.shape[0], np.iinfo(np.int64).max, dtype=np.int64)
+  np.minimum.at(first, pair_point[inside], pair_county[inside])
+  resolved = first[pending] != np.iinfo(np.int64).max
+  hits[pending[resolved]] = first[pending[resolved]]
+  return hits
 
 
 def step1_verify_total_dcs(data):
@@ -92,36 +219,70 @@ def step1_verify_total_dcs(data):
   return total_dcs
 
 
-def step2_count_by_county(data, county_polygons):
+def assign_counties_pip(features, county_polygons, county_grid=None):
+  """
+  Point-in-polygon county assignment for every DC at once.
+
+  Points are looked up in the county grid index (built here if the loader
+  did not supply one), so most resolve with a single cell fetch and the
+  rest go through shapely's contains_xy. Returns
+  {feature_index: county_name}; when a point falls in several polygons the
+  first county in file order wins, as in a linear scan.
+  """
+  county_names = list(county_polygons.keys())
+  polygons = list(county_polygons.values())
+
+  # Per-county bounds (minx, miny, maxx, maxy), computed once; their union
+  # rejects points outside every county with four float compares
+  county_bboxes = [poly.bounds for poly in polygons]
+  minx = min(b[0] for b in county_bboxes)
+  miny = min(b[1] for b in county_bboxes)
+  maxx = max(b[2] for b in county_bboxes)
+  maxy = max(b[3] for b in county_bboxes)
+
+  feature_idx = []
+  xy = []
+  for i, feature in enumerate(features):
+    geom = feature.get("geometry") or {}
+    coords = geom.get("coordinates") or []
+    if isinstance(coords, (list, tuple)) and len(coords) == 2:
+      try:
+        x, y = float(coords[0]), float(coords[1])
+      except (TypeError, ValueError):
+        continue
+      if x < minx or x > maxx or y < miny or y > maxy:
+        continue
+      xy.append((x, y))
+      feature_idx.append(i)
+
+  if not xy:
+    return {}
+
+  if county_grid is None:
+    county_grid = build_county_grid(polygons)
+  xy_arr = np.asarray(xy, dtype=np.float64)
+  hits = lookup_county_grid(county_grid, polygons, xy_arr[:, 0], xy_arr[:, 1])
+  return {feature_idx[p]: county_names[c] for p, c in enumerate(hits.tolist()) if c >= 0}
+
+
+def step2_count_by_county(data, county_polygons, county_grid=None):
   print("=" * 80)
   print("STEP 2: COUNT DCS BY COUNTY")
   print("=" * 80)
   print()
 
   county_counts = Counter()
+  features = data.get("features", [])
 
   if not HAVE_SHAPELY or not county_polygons:
     print("⚠️  shapely or county polygons missing - falling back to TEXT-based parsing (less reliable).")
-
-  for feature in data.get("features", []):
-    geom = feature.get("geometry") or {}
-    coords = geom.get("coordinates") or []
-
-    assigned_county = None
-
+    pip_counties = {}
+  else:
     # Preferred: point-in-polygon using coordinates
-    if HAVE_SHAPELY and county_polygons and isinstance(coords, (list, tuple)) and len(coords) == 2:
-      try:
-        pt = Point(coords[0], coords[1])
-        for cname, poly in county_polygons.items():
-          try:
-            if poly.contains(pt):
-              assigned_county = cname
-              break
-          except Exception:
-            continue
-      except Exception:
-        assigned_county = None
+    pip_counties = assign_counties_pip(features, county_polygons, county_grid)
+
+  for i, feature in enumerate(features):
+    assigned_county = pip_counties.get(i)
 
     # Fallback: extremely rough text-based parse if PIP failed
     if not assigned_county:
@@ -158,18 +319,15 @@ def step3_metro_counts(county_counts, total_dcs):
   print("=" * 80)
   print()
 
-  METRO_DEFINITIONS = {
-    "DFW": ["Dallas", "Tarrant", "Collin", "Denton", "Ellis", "Rockwall", "Kaufman", "Johnson"],
-    "Austin": ["Travis", "Williamson", "Hays", "Bastrop", "Caldwell"],
-    "Houston": ["Harris", "Fort Bend", "Montgomery", "Brazoria", "Galveston", "Liberty", "Chambers", "Waller"],
-    "San Antonio": ["Bexar", "Guadalupe", "Comal", "Wilson", "Medina"],
-  }
-
-  metro_counts = {}
+  # One pass over the observed counties via the county -> metro index
+  metro_counts = dict.fromkeys(METRO_DEFINITIONS, 0)
+  for county, dc_count in county_counts.items():
+    metro_name = COUNTY_TO_METRO.get(county)
+    if metro_name is not None:
+      metro_counts[metro_name] += dc_count
 
   for metro_name, counties in METRO_DEFINITIONS.items():
-    count = sum(county_counts.get(county, 0) for county in counties)
-    metro_counts[metro_name] = count
+    count = metro_counts[metro_name]
 
     print(f"{metro_name} Metro:")
     for county in counties:
@@ -198,22 +356,12 @@ def step4_non_metro(county_counts, metro_counts):
   print("=" * 80)
   print()
 
-  METRO_DEFINITIONS = {
-    "DFW": ["Dallas", "Tarrant", "Collin", "Denton", "Ellis", "Rockwall", "Kaufman", "Johnson"],
-    "Austin": ["Travis", "Williamson", "Hays", "Bastrop", "Caldwell"],
-    "Houston": ["Harris", "Fort Bend", "Montgomery", "Brazoria", "Galveston", "Liberty", "Chambers", "Waller"],
-    "San Antonio": ["Bexar", "Guadalupe", "Comal", "Wilson", "Medina"],
+  non_metro_dcs = {
+    county: count
+    for county, count in county_counts.items()
+    if county not in ALL_METRO_COUNTIES and count > 0
   }
 
-  all_metro_counties = set()
-  for counties in METRO_DEFINITIONS.values():
-    all_metro_counties.update(counties)
-
-  non_metro_dcs = {}
-  for county, count in county_counts.items():
-    if county not in all_metro_counties and count > 0:
-      non_metro_dcs[county] = count
-
   print("Non-metro counties with DCs:")
   for county, count in sorted(non_metro_dcs.items(), key=lambda x: x[1], reverse=True):
     print(f"  {county}: {count} DCs")
@@ -280,28 +428,30 @@ def step6_reconcile_pipeline(base_path: Path):
   conn = sqlite3.connect(str(db_path))
   cursor = conn.cursor()
 
-  # Count total projects
-  cursor.execute("SELECT COUNT(*) FROM projects")
-  total_projects = cursor.fetchone()[0]
+  # Total and geocoded project counts in one pass
+  cursor.execute(
+    """
+    SELECT
+        COUNT(*),
+        SUM(CASE WHEN lat IS NOT NULL AND lng IS NOT NULL THEN 1 ELSE 0 END)
+    FROM projects
+    """
+  )
+  total_projects, geocoded_projects = cursor.fetchone()
   print(f"Total projects in pipeline: {total_projects}")
+  print(f"Projects with coordinates: {geocoded_projects or 0}")
 
-  # Count projects with coordinates
-  cursor.execute("SELECT COUNT(*) FROM projects WHERE lat IS NOT NULL AND lng IS NOT NULL")
-  geocoded_projects = cursor.fetchone()[0]
-  print(f"Projects with coordinates: {geocoded_projects}")
-
-  # Count by status
+  # Count by status (project_status.project_id is UNIQUE, so the join is indexed)
   cursor.execute(
     """
-    SELECT ps.status_current, COUNT(*) 
+    SELECT ps.status_current, COUNT(*)
     FROM projects p
     LEFT JOIN project_status ps ON p.project_id = ps.project_id
     GROUP BY ps.status_current
     """
   )
-  status_counts = cursor.fetchall()
   print("\nProjects by status:")
-  for status, count in status_counts:
+  for status, count in cursor:
     label = status if status is not None else "Unknown"
     print(f"  {label}: {count}")
 
@@ -317,22 +467,16 @@ def step7_concentration_metrics(county_counts, total_dcs):
 
   sorted_counties = county_counts.most_common()
 
-  cumulative_dcs = 0
-  fifty_reported = False
-
-  for i, (county, count) in enumerate(sorted_counties, 1):
-    cumulative_dcs += count
-    pct = (cumulative_dcs / total_dcs * 100) if total_dcs > 0 else 0
+  # Cumulative share is non-decreasing, so each threshold is a bisect
+  cumulative = list(accumulate(count for _, count in sorted_counties))
+  cumulative_pct = [
+    (cum / total_dcs * 100) if total_dcs > 0 else 0 for cum in cumulative
+  ]
 
-    if not fifty_reported and pct >= 50:
-      print(f"50% of DCs in top {i} counties ({cumulative_dcs} DCs)")
-      fifty_reported = True
-    if pct >= 75:
-      print(f"75% of DCs in top {i} counties ({cumulative_dcs} DCs)")
-      break
-    if pct >= 80:
-      print(f"80% of DCs in top {i} counties ({cumulative_dcs} DCs)")
-      break
+  for threshold in (50, 75, 80):
+    idx = bisect_left(cumulative_pct, threshold)
+    if idx < len(cumulative):
+      print(f"{threshold}% of DCs in top {idx + 1} counties ({cumulative[idx]} DCs)")
 
   # 80/20 rule test
   n_counties = len(sorted_counties)
@@ -347,13 +491,13 @@ def step7_concentration_metrics(county_counts, total_dcs):
 def main():
   base_path = Path(__file__).parent.parent.parent
   data = load_texas_data_centers(base_path)
-  county_polygons = load_ercot_county_polygons(base_path)
+  county_polygons, county_grid = load_ercot_county_polygons(base_path)
 
   # Step 1: Verify DC count and list
   total_dcs = step1_verify_total_dcs(data)
 
   # Step 2: Count by county
-  county_counts = step2_count_by_county(data, county_polygons)
+  county_counts = step2_count_by_county(data, county_polygons, county_grid)
 
   # Step 3: Metro counts
   metro_counts = step3_metro_counts(county_counts, total_dcs)
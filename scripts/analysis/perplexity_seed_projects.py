@@ -9,24 +9,45 @@ This script:
 - Writes candidates to data/analysis/perplexity_seeds.json
 """
 
+import io
 import os
 import json
+import queue
 import sqlite3
+import threading
 import requests
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from dotenv import load_dotenv
 
+import _paths  # noqa: F401
+from _jsonio import dumps_json
+
+try:
+    import ijson
+    HAVE_IJSON = True
+except ImportError:
+    HAVE_IJSON = False
+
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DB_PATH = BASE_DIR / "data" / "news" / "news_pipeline.db"
 SEEDS_PATH = BASE_DIR / "data" / "analysis" / "perplexity_seeds.json"
+DEBUG_DIR = BASE_DIR / "data" / "analysis" / "perplexity_raw"
 
 load_dotenv(BASE_DIR / ".env.local")
 PERPLEXITY_API_KEY = os.getenv("PRP")
 PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
 MODEL = "sonar-pro"
+# Upper bound on in-flight Perplexity requests (and pooled connections)
+MAX_CONCURRENT_PROMPTS = 8
 
 
 DISCOVERY_PROMPTS = [
@@ -52,9 +73,101 @@ SYSTEM_MESSAGE = (
 )
 
 
-def call_perplexity(prompt: str) -> Dict[str, Any]:
+def make_session() -> requests.Session:
+    """Pooled HTTPS session that retries rate limits and transient 5xx replies."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=MAX_CONCURRENT_PROMPTS,
+        pool_maxsize=MAX_CONCURRENT_PROMPTS,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every call (and worker thread) so TCP/TLS connections are reused
+_SESSION = make_session()
+
+# Unparsable replies waiting for _debug_writer to dump them into DEBUG_DIR;
+# None tells the writer to exit
+_debug_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+_debug_thread: Optional[threading.Thread] = None
+_debug_lock = threading.Lock()
+
+
+def _debug_writer() -> None:
+    """Write queued unparsable replies to DEBUG_DIR/response_<n>.txt.
+
+    Runs on a single thread so Perplexity calls never wait on disk, until
+    it reads the None sentinel. The directory is created and scanned for the
+    highest existing index on the first dump; later dumps count up from it
+    in memory.
+    """
+    idx = None
+    while True:
+        content = _debug_queue.get()
+        if content is None:
+            return
+        try:
+            if idx is None:
+                DEBUG_DIR.mkdir(parents=True, exist_ok=True)
+                suffixes = (p.stem.split("_", 1)[1] for p in DEBUG_DIR.glob("response_*.txt"))
+                idx = max((int(n) for n in suffixes if n.isdigit()), default=0)
+            idx += 1
+            debug_path = DEBUG_DIR / f"response_{idx}.txt"
+            with open(debug_path, "w") as f:
+                f.write(content)
+            print(f"  ⚠️ Saved unparsable Perplexity response to {debug_path}")
+        except OSError as e:
+            print(f"  ⚠️ Could not save unparsable Perplexity response: {e}")
+
+
+def _start_debug_writer() -> None:
+    """Start the _debug_writer thread unless it is already running."""
+    global _debug_thread
+    with _debug_lock:
+        if _debug_thread is None:
+            _debug_thread = threading.Thread(
+                target=_debug_writer, name="perplexity-debug-writer", daemon=True
+            )
+            _debug_thread.start()
+
+
+def _stop_debug_writer() -> None:
+    """Wait for the writer to dump everything queued so far, then exit it."""
+    global _debug_thread
+    with _debug_lock:
+        thread, _debug_thread = _debug_thread, None
+    if thread is not None:
+        _debug_queue.put(None)
+        thread.join()
+
+
+def stream_projects(content: str) -> Optional[List[Any]]:
+    """Pull the project records out of a strict JSON reply with ijson.
+
+    Reads ``projects.item`` from an object reply (``item`` from a bare list)
+    without materializing the rest of the document. Returns None when the
+    reply is not strict JSON so the caller can fall back to lenient parsing.
+    """
+    body = content.strip().encode("utf-8")
+    prefix = "item" if body.startswith(b"[") else "projects.item"
+    try:
+        return list(ijson.items(io.BytesIO(body), prefix, use_float=True))
+    except ijson.JSONError:
+        return None
+
+
+def call_perplexity(prompt: str, session: requests.Session = None) -> Dict[str, Any]:
     """Call Perplexity API with a discovery prompt and return parsed JSON.
 
+    Posts through ``session`` (default: the shared pooled, retrying session).
     If JSON parsing fails, dump the raw content to a debug file and return {}.
     """
     if not PERPLEXITY_API_KEY:
@@ -74,11 +187,16 @@ def call_perplexity(prompt: str) -> Dict[str, Any]:
         "max_tokens": 800,
     }
 
-    resp = requests.post(PERPLEXITY_URL, headers=headers, json=payload, timeout=45)
+    resp = (session or _SESSION).post(PERPLEXITY_URL, headers=headers, json=payload, timeout=45)
     resp.raise_for_status()
     data = resp.json()
     content = data["choices"][0]["message"]["content"]
 
+    if HAVE_IJSON:
+        projects = stream_projects(content)
+        if projects is not None:
+            return {"projects": projects}
+
     # Try to parse as JSON; if it fails, try to extract JSON substring,
     # and if that still fails, write raw content to disk for inspection.
     try:
@@ -93,64 +211,145 @@ def call_perplexity(prompt: str) -> Dict[str, Any]:
                 pass
 
         # Fallback: write raw content so we can inspect what Perplexity sent
-        debug_dir = BASE_DIR / "data" / "analysis" / "perplexity_raw"
-        debug_dir.mkdir(parents=True, exist_ok=True)
-        idx = len(list(debug_dir.glob("response_*.txt"))) + 1
-        debug_path = debug_dir / f"response_{idx}.txt"
-        with open(debug_path, "w") as f:
-            f.write(content)
-        print(f"  ⚠️ Saved unparsable Perplexity response to {debug_path}")
+        # (queued for the background writer, started on the first dump;
+        # call_perplexity_many stops it once every call is done)
+        _start_debug_writer()
+        _debug_queue.put(content)
         return {}
 
 
-def load_existing_projects() -> List[Dict[str, Any]]:
-    """Load existing Texas projects from the DB for de-duplication."""
+def call_perplexity_many(prompts: List[str]) -> List[Any]:
+    """Call Perplexity for every prompt concurrently over the shared session.
+
+    Returns one entry per prompt, in prompt order: the parsed JSON, or the
+    exception that call raised.
+    """
+    results: List[Any] = [None] * len(prompts)
+    if not prompts:
+        return results
+
+    workers = min(MAX_CONCURRENT_PROMPTS, len(prompts))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(call_perplexity, prompt): i
+                for i, prompt in enumerate(prompts)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = e
+    finally:
+        # Let queued debug dumps land before returning
+        _stop_debug_writer()
+    return results
+
+
+# Per-company rows: (years ascending, lowercased location_text aligned with
+# those years, location_text of rows with no usable year)
+CompanyBucket = Tuple[List[int], List[str], List[str]]
+# Lowercased company -> CompanyBucket
+ExistingIndex = Dict[str, CompanyBucket]
+
+
+def parse_year(value: Any) -> Optional[int]:
+    """Return the leading 4-digit year of a date-like value, or None."""
+    if not value:
+        return None
+    try:
+        return int(str(value)[:4])
+    except ValueError:
+        return None
+
+
+def load_existing_projects() -> ExistingIndex:
+    """Load existing Texas projects from the DB, indexed for de-duplication.
+
+    Rows are bucketed by normalized company; rows without a company live
+    under "" and are checked against every seed. Each bucket keeps its dated
+    rows sorted by year so is_duplicate can bisect to the +/-2 year window.
+    """
     conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        PRAGMA query_only=1;
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-65536;
+        """
+    )
+    # The Texas bounding-box read is served by idx_projects_texas, created
+    # by news-output/geocode_projects.py alongside the lat/lng columns
     cur = conn.cursor()
     cur.execute(
         """
-        SELECT project_name, company, location_text, announced_date
+        SELECT company, location_text, announced_date
         FROM projects
         WHERE lat BETWEEN 25 AND 37 AND lng BETWEEN -107 AND -93
         """
     )
-    rows = [dict(r) for r in cur.fetchall()]
+    rows_by_company: Dict[str, List[Tuple[str, Optional[int]]]] = defaultdict(list)
+    for company, location_text, announced_date in cur:
+        rows_by_company[(company or "").lower().strip()].append(
+            ((location_text or "").lower(), parse_year(announced_date))
+        )
     conn.close()
-    return rows
 
+    index: ExistingIndex = {}
+    for company, rows in rows_by_company.items():
+        dated = sorted((row for row in rows if row[1] is not None), key=lambda row: row[1])
+        index[company] = (
+            [year for _, year in dated],
+            [loc for loc, _ in dated],
+            [loc for loc, year in rows if year is None],
+        )
+    return index
 
-def is_duplicate(seed: Dict[str, Any], existing: List[Dict[str, Any]]) -> bool:
+
+def is_duplicate(seed: Dict[str, Any], existing: ExistingIndex) -> bool:
     """Crude duplicate check: company + (city/county) + rough year vs existing."""
     s_company = (seed.get("company") or "").lower().strip()
     s_city = (seed.get("city") or "").lower().strip()
     s_county = (seed.get("county") or "").lower().strip()
-    s_year = seed.get("announced_year")
-
-    for row in existing:
-        r_company = (row.get("company") or "").lower().strip()
-        r_loc = (row.get("location_text") or "").lower()
-
-        if s_company and r_company and s_company != r_company:
-            continue
+    if not (s_city or s_county):
+        return False
+    # Missing or unparsable years on either side count as a match
+    try:
+        s_year = int(seed.get("announced_year") or 0) or None
+    except (TypeError, ValueError):
+        s_year = None
+
+    # Only same-company and company-less rows can match a seed with a company
+    if s_company:
+        buckets = [existing[c] for c in (s_company, "") if c in existing]
+    else:
+        buckets = existing.values()
+
+    for years, dated_locs, undated_locs in buckets:
+        # loose year check: rows within 2 years, or with no year on either side
+        if s_year is None:
+            candidates = (dated_locs, undated_locs)
+        else:
+            lo = bisect_left(years, s_year - 2)
+            hi = bisect_right(years, s_year + 2)
+            candidates = (dated_locs[lo:hi], undated_locs)
+        for locs in candidates:
+            for r_loc in locs:
+                # crude location match: city or county substring match in location_text
+                if (s_city and s_city in r_loc) or (s_county and s_county in r_loc):
+                    return True
 
-        # crude location match: city or county substring match in location_text
-        city_match = s_city and s_city in r_loc
-        county_match = s_county and s_county in r_loc
-        if not (city_match or county_match):
-            continue
+    return False
 
-        # loose year check
-        if not s_year or not row.get("announced_date"):
-            return True
-        try:
-            r_year = int(str(row["announced_date"])[:4])
-            if abs(r_year - int(s_year)) <= 2:
-                return True
-        except Exception:
-            return True
 
-    return False
+def seed_key(seed: Dict[str, Any]) -> Tuple[str, str, str]:
+    """A seed's normalized (company, city, project_name)."""
+    return (
+        (seed.get("company") or "").lower().strip(),
+        (seed.get("city") or "").lower().strip(),
+        (seed.get("project_name") or "").lower().strip(),
+    )
 
 
 def main() -> None:
@@ -161,14 +360,18 @@ def main() -> None:
         raise FileNotFoundError(f"Database not found at {DB_PATH}")
 
     existing = load_existing_projects()
-    all_seeds: List[Dict[str, Any]] = []
+    # Seeds are de-duplicated among themselves (by company+city+project_name)
+    # as they are accepted; the first occurrence wins
+    seen: Set[Tuple[str, str, str]] = set()
+    unique_seeds: List[Dict[str, Any]] = []
 
-    for i, prompt in enumerate(DISCOVERY_PROMPTS, 1):
-        print(f"[{i}/{len(DISCOVERY_PROMPTS)}] Calling Perplexity…")
-        try:
-            result = call_perplexity(prompt)
-        except Exception as e:
-            print(f"  ⚠️ Perplexity error: {e}")
+    print(f"Calling Perplexity with {len(DISCOVERY_PROMPTS)} prompt(s)…")
+    results = call_perplexity_many(DISCOVERY_PROMPTS)
+
+    for i, result in enumerate(results, 1):
+        print(f"[{i}/{len(DISCOVERY_PROMPTS)}] Perplexity response")
+        if isinstance(result, Exception):
+            print(f"  ⚠️ Perplexity error: {result}")
             continue
 
         # Handle both dict with "projects" key and direct list
@@ -183,28 +386,15 @@ def main() -> None:
         for p in projects:
             if not isinstance(p, dict):
                 continue
-            if is_duplicate(p, existing):
+            key = seed_key(p)
+            if key in seen or is_duplicate(p, existing):
                 continue
+            seen.add(key)
             p["source_prompt"] = f"discovery_{i}"
-            all_seeds.append(p)
-
-    # De-dup seeds themselves (by company+city+project_name)
-    seen = set()
-    unique_seeds: List[Dict[str, Any]] = []
-    for p in all_seeds:
-        key = (
-            (p.get("company") or "").lower().strip(),
-            (p.get("city") or "").lower().strip(),
-            (p.get("project_name") or "").lower().strip(),
-        )
-        if key in seen:
-            continue
-        seen.add(key)
-        unique_seeds.append(p)
+            unique_seeds.append(p)
 
     SEEDS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(SEEDS_PATH, "w") as f:
-        json.dump({"seeds": unique_seeds}, f, indent=2)
+    SEEDS_PATH.write_bytes(dumps_json({"seeds": unique_seeds}, indent=True))
 
     print(f"✅ Saved {len(unique_seeds)} non-duplicate seed projects to {SEEDS_PATH}")
 
@@ -2,29 +2,33 @@
 """
 Test correlation between battery capacity and data center announcements by county
 """
-import json
 from pathlib import Path
 from collections import defaultdict
 
-def get_battery_dc_correlation():
-    """Analyze correlation between battery capacity and DC count by county."""
-    base_path = Path(__file__).parent.parent.parent
-    
-    # Load DC data
-    dc_path = base_path / 'data/analysis/story1_dc_by_county.json'
-    with open(dc_path, 'r') as f:
-        dc_data = json.load(f)
-        dc_by_county = dc_data.get('county_counts', {})
-    
-    # Load ERCOT data
-    ercot_path = base_path / 'public/data/ercot/ercot_counties_aggregated.geojson'
-    with open(ercot_path, 'r') as f:
-        ercot_data = json.load(f)
-    
-    # Extract battery capacity by county
+import numpy as np
+
+import _paths  # noqa: F401
+from _ercot_cache import cached_pickle, iter_feature_properties
+from _jsonio import dumps_json, load_json
+
+def pearson_correlation(xs, ys):
+    """Pearson correlation of two equal-length sequences, or None if undefined."""
+    n = len(xs)
+    if n < 2:
+        return None
+    
+    x_arr = np.fromiter(xs, dtype=np.float64, count=n)
+    y_arr = np.fromiter(ys, dtype=np.float64, count=n)
+    # Constant input has no defined correlation (corrcoef would give nan)
+    if np.ptp(x_arr) == 0 or np.ptp(y_arr) == 0:
+        return None
+    return float(np.corrcoef(x_arr, y_arr)[0, 1])
+
+def build_battery_by_county(ercot_path):
+    """Battery capacity/project count per county from the ERCOT GeoJSON."""
     battery_by_county = {}
-    for feature in ercot_data.get('features', []):
-        props = feature.get('properties', {})
+    for props in iter_feature_properties(ercot_path):
+        props = props or {}
         county = props.get('NAME', '')
         battery_capacity = props.get('fuel_battery_capacity', 0) or 0
         battery_count = props.get('fuel_battery_count', 0) or 0
@@ -34,20 +38,44 @@ def get_battery_dc_correlation():
                 'capacity_mw': battery_capacity,
                 'project_count': battery_count
             }
+    return battery_by_county
+
+def get_battery_dc_correlation():
+    """Analyze correlation between battery capacity and DC count by county."""
+    base_path = Path(__file__).parent.parent.parent
     
-    # Combine data
-    combined = []
-    for county, dc_count in dc_by_county.items():
-        battery_info = battery_by_county.get(county, {'capacity_mw': 0, 'project_count': 0})
-        combined.append({
-            'county': county,
-            'dc_count': dc_count,
-            'battery_capacity_mw': battery_info['capacity_mw'],
-            'battery_project_count': battery_info['project_count']
-        })
+    # Load DC data
+    dc_path = base_path / 'data/analysis/story1_dc_by_county.json'
+    dc_data = load_json(dc_path)
+    dc_by_county = dc_data.get('county_counts', {})
     
-    # Sort by DC count
-    combined.sort(key=lambda x: x['dc_count'], reverse=True)
+    # Load ERCOT data and extract battery capacity by county
+    ercot_path = base_path / 'public/data/ercot/ercot_counties_aggregated.geojson'
+    # The small result is pickled, so later runs skip parsing the polygons
+    # file entirely
+    battery_by_county = cached_pickle(
+        ercot_path, 'battery_by_county', lambda: build_battery_by_county(ercot_path))
+    
+    # Combine data as parallel per-county columns; the correlation reads the
+    # columns directly and the report rows are built from them once
+    no_battery = {'capacity_mw': 0, 'project_count': 0}
+    counties = list(dc_by_county)
+    dc_values = [dc_by_county[county] for county in counties]
+    battery_infos = [battery_by_county.get(county, no_battery) for county in counties]
+    battery_values = [info['capacity_mw'] for info in battery_infos]
+    battery_projects = [info['project_count'] for info in battery_infos]
+    
+    # Sort by DC count (stable, so ties keep file order)
+    order = sorted(range(len(counties)), key=dc_values.__getitem__, reverse=True)
+    combined = [
+        {
+            'county': counties[i],
+            'dc_count': dc_values[i],
+            'battery_capacity_mw': battery_values[i],
+            'battery_project_count': battery_projects[i]
+        }
+        for i in order
+    ]
     
     print("=" * 80)
     print("BATTERY CAPACITY vs DATA CENTER CORRELATION")
@@ -79,47 +107,38 @@ def get_battery_dc_correlation():
     print(f"   Counties with DCs but no batteries: {len(combined) - counties_with_both}")
     
     # Calculate correlation coefficient (simple Pearson)
-    dc_values = [x['dc_count'] for x in combined]
-    battery_values = [x['battery_capacity_mw'] for x in combined]
-    
-    if len(dc_values) > 1:
-        import statistics
-        mean_dc = statistics.mean(dc_values)
-        mean_battery = statistics.mean(battery_values)
+    correlation = pearson_correlation(dc_values, battery_values)
+    if correlation is not None:
+        print(f"   Correlation coefficient: {correlation:.3f}")
         
-        numerator = sum((dc_values[i] - mean_dc) * (battery_values[i] - mean_battery) 
-                       for i in range(len(dc_values)))
-        denom_dc = sum((x - mean_dc) ** 2 for x in dc_values)
-        denom_battery = sum((x - mean_battery) ** 2 for x in battery_values)
+        if abs(correlation) < 0.1:
+            interpretation = "No correlation"
+        elif abs(correlation) < 0.3:
+            interpretation = "Weak correlation"
+        elif abs(correlation) < 0.7:
+            interpretation = "Moderate correlation"
+        else:
+            interpretation = "Strong correlation"
         
-        if denom_dc > 0 and denom_battery > 0:
-            correlation = numerator / ((denom_dc * denom_battery) ** 0.5)
-            print(f"   Correlation coefficient: {correlation:.3f}")
-            
-            if abs(correlation) < 0.1:
-                interpretation = "No correlation"
-            elif abs(correlation) < 0.3:
-                interpretation = "Weak correlation"
-            elif abs(correlation) < 0.7:
-                interpretation = "Moderate correlation"
-            else:
-                interpretation = "Strong correlation"
-            
-            direction = "positive" if correlation > 0 else "negative"
-            print(f"   Interpretation: {interpretation} ({direction})")
+        direction = "positive" if correlation > 0 else "negative"
+        print(f"   Interpretation: {interpretation} ({direction})")
     
     # Top battery counties without DCs
     print(f"\n📊 Top Battery Counties WITHOUT Data Centers:")
-    battery_only = [
-        {
+    battery_only = []
+    for county, info in battery_by_county.items():
+        capacity_mw = info['capacity_mw']
+        if not capacity_mw > 0:
+            continue
+        dc_count = dc_by_county.get(county, 0)
+        if dc_count != 0:
+            continue
+        battery_only.append({
             'county': county,
-            'battery_capacity_mw': info['capacity_mw'],
+            'battery_capacity_mw': capacity_mw,
             'battery_project_count': info['project_count'],
-            'dc_count': dc_by_county.get(county, 0)
-        }
-        for county, info in battery_by_county.items()
-        if info['capacity_mw'] > 0 and dc_by_county.get(county, 0) == 0
-    ]
+            'dc_count': dc_count
+        })
     battery_only.sort(key=lambda x: x['battery_capacity_mw'], reverse=True)
     
     for entry in battery_only[:10]:
@@ -131,7 +150,7 @@ def get_battery_dc_correlation():
             'counties_with_dcs': len(combined),
             'counties_with_both': counties_with_both,
             'counties_dc_only': len(combined) - counties_with_both,
-            'correlation_coefficient': correlation if 'correlation' in locals() else None
+            'correlation_coefficient': correlation
         },
         'battery_only_counties': battery_only[:20]
     }
@@ -145,8 +164,7 @@ if __name__ == '__main__':
     output_path = Path(__file__).parent.parent.parent / 'data/analysis/story1_battery_correlation.json'
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    output_path.write_bytes(dumps_json(result, indent=True))
     
     print(f"\n✅ Saved to {output_path}")
 
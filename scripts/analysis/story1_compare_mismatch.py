@@ -3,17 +3,26 @@
 Compare data center locations vs ERCOT energy capacity by county.
 Generate mismatch analysis report.
 """
-import json
 from pathlib import Path
 from datetime import datetime
 
+import _paths  # noqa: F401
+from _jsonio import dumps_json, load_json
+
+# Raw county name -> normalized name. County names are a small closed set,
+# so each distinct spelling is normalized once and then served from here.
+_COUNTY_CANON = {}
+
 def normalize_county_name(name):
     """Normalize county name for matching."""
     if not name:
         return None
-    # Remove "County" suffix, lowercase, strip
-    name = name.replace(' County', '').replace(' county', '').strip().lower()
-    return name
+    canon = _COUNTY_CANON.get(name)
+    if canon is None:
+        # Remove "County" suffix, lowercase, strip
+        canon = name.replace(' County', '').replace(' county', '').strip().lower()
+        _COUNTY_CANON[name] = canon
+    return canon
 
 def compare_mismatch():
     """Compare DC counties vs ERCOT counties."""
@@ -30,12 +39,10 @@ def compare_mismatch():
         print(f"❌ Error: {ercot_path} not found. Run story1_extract_ercot_by_county.py first.")
         return
     
-    with open(dc_path, 'r') as f:
-        dc_data = json.load(f)
-        dc_by_county = dc_data.get('county_counts', {})
+    dc_data = load_json(dc_path)
+    dc_by_county = dc_data.get('county_counts', {})
     
-    with open(ercot_path, 'r') as f:
-        ercot_by_county = json.load(f)
+    ercot_by_county = load_json(ercot_path)
     
     # Get top 10 for each
     top10_dc = list(dc_by_county.items())[:10]
@@ -49,10 +56,12 @@ def compare_mismatch():
     dc_counties_normalized = {normalize_county_name(k): k for k, v in top10_dc}
     ercot_counties_normalized = {normalize_county_name(k): k for k, v in top10_ercot}
     
-    # Find overlap
-    overlap = set(dc_counties_normalized.keys()) & set(ercot_counties_normalized.keys())
-    dc_only = set(dc_counties_normalized.keys()) - set(ercot_counties_normalized.keys())
-    ercot_only = set(ercot_counties_normalized.keys()) - set(dc_counties_normalized.keys())
+    # Find overlap (each key set is hashed once)
+    dc_keys = frozenset(dc_counties_normalized)
+    ercot_keys = frozenset(ercot_counties_normalized)
+    overlap = dc_keys & ercot_keys
+    dc_only = dc_keys - ercot_keys
+    ercot_only = ercot_keys - dc_keys
     
     # Check for counties in ERCOT top 10 that have DCs but aren't in DC top 10
     ercot_with_dcs_but_not_top10 = []
@@ -161,8 +170,7 @@ def compare_mismatch():
     output_path = base_path / 'data/analysis/story1_mismatch_report.json'
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(report, f, indent=2)
+    output_path.write_bytes(dumps_json(report, indent=True))
     
     print(f"\n✅ Report saved to {output_path}")
     
@@ -3,48 +3,114 @@
 Deep dive into Harris County profile to test Hypothesis B.
 Analyzes energy infrastructure, metro characteristics, and timeline.
 """
-import json
-import sqlite3
+import sys
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
 
+import _paths  # noqa: F401
+from _ercot_cache import (
+    iter_features,
+    load_county_projects,
+    load_ercot_by_name,
+)
+from _jsonio import load_json
+
+# Row templates, bound once rather than re-evaluated as f-strings per row
+_FUEL_SHARE = "  {fuel}: {capacity:,.0f} MW ({pct:.1f}%)".format
+_COMPARISON_ROW = "{county:<15} {type:<20} {energy_gw:>10.2f} {dc_count:>10} {surplus_gw:>10.2f}".format
+
+def _year(value):
+    """Leading 4-digit year of a date-like value, or None."""
+    head = str(value or '')[:4]
+    return int(head) if len(head) == 4 and head.isdecimal() else None
+
+# Static narrative text, written in one go instead of line-by-line prints
+METRO_HUB_BLOCK = """\
+3. METRO vs ENERGY HUB CHARACTERISTICS
+--------------------------------------------------------------------------------
+Metro characteristics:
+  ✅ Houston metro: 7.5M population (4th largest US metro)
+  ✅ Major tech hub: Talent pool, fiber infrastructure
+  ✅ Customer base: Large enterprises, cloud providers
+
+Energy hub characteristics:
+  ✅ Oil/gas capital: 100+ year legacy
+  ✅ Refineries: Petrochemical industry
+  ✅ Port: Houston Ship Channel (industrial infrastructure)
+  ✅ Energy expertise: Engineers, operators, infrastructure
+
+Assessment:
+  ✅ Harris is BOTH metro AND energy hub
+  → Started with energy (oil/gas industry)
+  → Grew into metro (population, tech)
+  → Now attracts DCs (leverages both)
+
+"""
+
+HYBRID_EVIDENCE_BLOCK = """
+  Question: Did Harris START hybrid or BECOME hybrid?
+
+  Evidence:
+    - Houston = oil/gas capital (1900s) → energy infrastructure
+    - Houston = major metro (7.5M) → talent/customers
+    - Data centers arrived (2020s) → leveraged both
+
+  Conclusion: Harris STARTED with both characteristics
+    → Inherited energy infrastructure from oil/gas industry
+    → Grew into metro around energy industry
+    → DCs followed (path dependency)
+
+  This supports Hypothesis B:
+    - Harris is exception (started with both)
+    - Other counties can't replicate (no 100-year energy legacy)
+    - Specialization is the norm
+"""
+
+KEY_INSIGHTS_FOOTER = """
+Metro + Energy Hub:
+  ✅ Harris has BOTH characteristics
+  ✅ Started with energy (oil/gas legacy)
+  ✅ Grew into metro (population, tech)
+  ✅ DCs followed (leverages both)
+
+Hypothesis B validation:
+  ✅ Harris is exception (started hybrid)
+  ✅ Other counties specialize (producer OR consumer)
+  ✅ Can't BECOME hybrid, must START hybrid
+"""
+
 def analyze_harris_county():
     """Comprehensive analysis of Harris County profile."""
     base_path = Path(__file__).parent.parent.parent
-    
+
     print("=" * 80)
     print("HARRIS COUNTY PROFILE ANALYSIS")
     print("Testing Hypothesis B: Specialization vs Hybrid")
     print("=" * 80)
     print()
-    
+
     # 1. ERCOT Energy Data
     print("1. ENERGY INFRASTRUCTURE (ERCOT)")
     print("-" * 80)
-    
+
     ercot_path = base_path / 'public/data/ercot/ercot_counties_aggregated_fixed.geojson'
     if not ercot_path.exists():
         ercot_path = base_path / 'public/data/ercot/ercot_counties_aggregated.geojson'
-    
-    with open(ercot_path, 'r') as f:
-        ercot_data = json.load(f)
-    
-    harris_ercot = None
-    for feature in ercot_data['features']:
-        props = feature.get('properties', {})
-        if props.get('NAME', '').strip() == 'Harris':
-            harris_ercot = props
-            break
-    
+
+    # County NAME -> properties (no polygons), shared with section 5
+    ercot_by_name = load_ercot_by_name(ercot_path)
+
+    harris_ercot = ercot_by_name.get('Harris')
+
     if harris_ercot:
         total_cap = harris_ercot.get('total_capacity_mw', 0) or 0
         total_cap_gw = total_cap / 1000
-        
+
         print(f"Total operational capacity: {total_cap:,.0f} MW ({total_cap_gw:.2f} GW)")
         print(f"Total projects: {harris_ercot.get('project_count', 0)}")
         print()
-        
+
         print("Fuel breakdown:")
         gas_cap = harris_ercot.get('fuel_gas_capacity', 0) or 0
         solar_cap = harris_ercot.get('fuel_solar_capacity', 0) or 0
@@ -52,25 +118,27 @@ def analyze_harris_county():
         battery_cap = harris_ercot.get('fuel_battery_capacity', 0) or 0
         storage_cap = harris_ercot.get('fuel_storage_capacity', 0) or 0
         nuclear_cap = harris_ercot.get('fuel_nuclear_capacity', 0) or 0
-        
-        gas_pct = (gas_cap / total_cap * 100) if total_cap > 0 else 0
-        solar_pct = (solar_cap / total_cap * 100) if total_cap > 0 else 0
-        wind_pct = (wind_cap / total_cap * 100) if total_cap > 0 else 0
-        battery_pct = (battery_cap / total_cap * 100) if total_cap > 0 else 0
-        
-        print(f"  Gas: {gas_cap:,.0f} MW ({gas_pct:.1f}%)")
-        print(f"  Solar: {solar_cap:,.0f} MW ({solar_pct:.1f}%)")
-        print(f"  Wind: {wind_cap:,.0f} MW ({wind_pct:.1f}%)")
-        print(f"  Battery: {battery_cap:,.0f} MW ({battery_pct:.1f}%)")
+
+        # MW -> % of total; one divide instead of one per fuel
+        pct_scale = 100 / total_cap if total_cap > 0 else 0
+        gas_pct = gas_cap * pct_scale
+        solar_pct = solar_cap * pct_scale
+        wind_pct = wind_cap * pct_scale
+        battery_pct = battery_cap * pct_scale
+
+        print(_FUEL_SHARE(fuel='Gas', capacity=gas_cap, pct=gas_pct))
+        print(_FUEL_SHARE(fuel='Solar', capacity=solar_cap, pct=solar_pct))
+        print(_FUEL_SHARE(fuel='Wind', capacity=wind_cap, pct=wind_pct))
+        print(_FUEL_SHARE(fuel='Battery', capacity=battery_cap, pct=battery_pct))
         print(f"  Storage: {storage_cap:,.0f} MW")
         print(f"  Nuclear: {nuclear_cap:,.0f} MW")
         print()
-        
+
         renewable_cap = solar_cap + wind_cap
-        renewable_pct = (renewable_cap / total_cap * 100) if total_cap > 0 else 0
+        renewable_pct = renewable_cap * pct_scale
         baseload_cap = gas_cap + nuclear_cap
-        baseload_pct = (baseload_cap / total_cap * 100) if total_cap > 0 else 0
-        
+        baseload_pct = baseload_cap * pct_scale
+
         print(f"Energy mix:")
         print(f"  Renewable (solar + wind): {renewable_cap:,.0f} MW ({renewable_pct:.1f}%)")
         print(f"  Baseload (gas + nuclear): {baseload_cap:,.0f} MW ({baseload_pct:.1f}%)")
@@ -78,7 +146,7 @@ def analyze_harris_county():
         print()
         print(f"Dominant fuel: {harris_ercot.get('dominant_fuel_type', 'N/A')}")
         print()
-        
+
         # Hypothesis B check
         print("Hypothesis B Check:")
         if baseload_pct > 50:
@@ -91,22 +159,21 @@ def analyze_harris_county():
     else:
         print("❌ Harris County not found in ERCOT data")
     print()
-    
+
     # 2. Data Center Profile
     print("2. DATA CENTER PROFILE")
     print("-" * 80)
-    
+
     # Get DC data
+    # Loaded once and indexed by county for section 5 as well
     gap_path = base_path / 'data/analysis/story1_power_demand_gap.json'
-    harris_dc = None
+    gap_by_county = {}
     if gap_path.exists():
-        with open(gap_path, 'r') as f:
-            gap_data = json.load(f)
+        gap_data = load_json(gap_path)
         for gap in gap_data.get('gaps_by_county', []):
-            if gap['county'] == 'Harris':
-                harris_dc = gap
-                break
-    
+            gap_by_county.setdefault(gap['county'], gap)
+    harris_dc = gap_by_county.get('Harris')
+
     if harris_dc:
         print(f"Data center count: {harris_dc['dc_count']}")
         print(f"DC demand: {harris_dc['dc_demand_gw']:.2f} GW")
@@ -122,150 +189,123 @@ def analyze_harris_county():
     else:
         print("DC data not found")
     print()
-    
+
     # 3. Metro vs Energy Hub Characteristics
-    print("3. METRO vs ENERGY HUB CHARACTERISTICS")
-    print("-" * 80)
-    
-    print("Metro characteristics:")
-    print("  ✅ Houston metro: 7.5M population (4th largest US metro)")
-    print("  ✅ Major tech hub: Talent pool, fiber infrastructure")
-    print("  ✅ Customer base: Large enterprises, cloud providers")
-    print()
-    
-    print("Energy hub characteristics:")
-    print("  ✅ Oil/gas capital: 100+ year legacy")
-    print("  ✅ Refineries: Petrochemical industry")
-    print("  ✅ Port: Houston Ship Channel (industrial infrastructure)")
-    print("  ✅ Energy expertise: Engineers, operators, infrastructure")
-    print()
-    
-    print("Assessment:")
-    print("  ✅ Harris is BOTH metro AND energy hub")
-    print("  → Started with energy (oil/gas industry)")
-    print("  → Grew into metro (population, tech)")
-    print("  → Now attracts DCs (leverages both)")
-    print()
-    
+    sys.stdout.write(METRO_HUB_BLOCK)
+
     # 4. Timeline Analysis
     print("4. TIMELINE: ENERGY vs DC DEVELOPMENT")
     print("-" * 80)
-    
+
     # Get ERCOT project timeline (from raw data if available)
     ercot_projects_path = base_path / 'public/data/ercot/ercot_gis_reports.geojson'
     harris_energy_projects = []
-    
+
     if ercot_projects_path.exists():
-        with open(ercot_projects_path, 'r') as f:
-            ercot_projects = json.load(f)
-        
-        for feature in ercot_projects.get('features', []):
-            props = feature.get('properties', {})
-            county = props.get('County', '').strip()
-            if county and 'Harris' in county:
-                # Check if operational (from fixed data, these should be operational)
-                status = props.get('GIM Study Phase', '')
-                cod = props.get('Projected COD', '')
-                harris_energy_projects.append({
-                    'name': props.get('Project Name', 'N/A'),
-                    'fuel': props.get('Fuel', 'N/A'),
-                    'capacity': props.get('Capacity (MW)', 0),
-                    'cod': cod,
-                    'status': status
-                })
-    
+        harris_energy_projects = load_county_projects(ercot_projects_path, 'Harris')
+
     print(f"ERCOT energy projects in Harris: {len(harris_energy_projects)}")
     if harris_energy_projects:
         # Group by fuel and show sample
         by_fuel = defaultdict(list)
         for p in harris_energy_projects:
             by_fuel[p['fuel']].append(p)
-        
+
         print("Projects by fuel type:")
         for fuel, projects in sorted(by_fuel.items(), key=lambda x: len(x[1]), reverse=True):
             total_cap = sum(p['capacity'] for p in projects)
             print(f"  {fuel}: {len(projects)} projects, {total_cap:,.0f} MW")
-        
+
         # Extract years from COD dates
-        cod_years = []
-        for p in harris_energy_projects:
-            if p['cod']:
-                try:
-                    year = int(str(p['cod'])[:4])
-                    cod_years.append(year)
-                except:
-                    pass
-        
-        if cod_years:
-            year_counts = defaultdict(int)
-            for year in cod_years:
-                year_counts[year] += 1
-            
+        year_counts = Counter(y for p in harris_energy_projects if (y := _year(p['cod'])) is not None)
+
+        if year_counts:
             print("\nEnergy projects by COD year (when they came online):")
             for year in sorted(year_counts.keys()):
                 print(f"  {year}: {year_counts[year]} projects")
     print()
-    
+
     # Get DC timeline
     db_path = base_path / 'data/news/news_pipeline.db'
     harris_dc_timeline = []
-    
+
     if db_path.exists():
-        conn = sqlite3.connect(str(db_path))
+        import sqlite3  # only loaded when there is a DB to read
+
+        # Read-only: nothing here writes, so don't contend with the pipeline
+        conn = sqlite3.connect(db_path.resolve().as_uri() + '?mode=ro', uri=True)
         conn.row_factory = sqlite3.Row
-        
+        conn.executescript("""
+            PRAGMA query_only=1;
+            PRAGMA mmap_size=268435456;
+        """)
+
         # Get projects in Harris County
         cursor = conn.execute("""
             SELECT project_id, project_name, company, announced_date, location_text
             FROM projects
             WHERE location_text LIKE '%Harris%' OR location_text LIKE '%Houston%'
         """)
-        
+
         harris_projects_db = cursor.fetchall()
-        
+
         # Also check GeoJSON for Harris County DCs
         dc_path = base_path / 'public/data/texas_data_centers.geojson'
         if dc_path.exists():
-            with open(dc_path, 'r') as f:
-                dc_data = json.load(f)
-            
             # Use point-in-polygon to find Harris County projects
             try:
-                from shapely.geometry import Point, shape
                 counties_path = base_path / 'public/data/texas/texas_counties.geojson'
-                
+
                 if counties_path.exists():
-                    with open(counties_path, 'r') as f:
-                        counties_data = json.load(f)
-                    
-                    # Find Harris County polygon
+                    # Deferred until there is something to intersect
+                    import numpy as np
+                    import shapely
+                    from shapely.geometry import shape
+
+                    # Find Harris County polygon (stop reading at the match)
                     harris_polygon = None
-                    for feature in counties_data['features']:
+                    for feature in iter_features(counties_path):
                         props = feature.get('properties', {})
                         if props.get('NAME', '').strip() == 'Harris':
                             geometry = feature.get('geometry', {})
                             if geometry:
                                 harris_polygon = shape(geometry)
                                 break
-                    
+
                     if harris_polygon:
-                        for feature in dc_data['features']:
+                        # Gather lon/lat columns, then test them all in one
+                        # vectorized call against the prepared polygon
+                        # (contains_xy needs no Point objects at all)
+                        dc_lons = []
+                        dc_lats = []
+                        dc_props = []
+                        for feature in iter_features(dc_path):
                             coords = feature.get('geometry', {}).get('coordinates', [])
                             if coords and len(coords) == 2:
-                                point = Point(coords[0], coords[1])
-                                if harris_polygon.contains(point):
-                                    props = feature.get('properties', {})
-                                    harris_dc_timeline.append({
-                                        'name': props.get('project_name', 'Unknown'),
-                                        'company': props.get('company', 'Unknown'),
-                                        'announced': props.get('announced_date', ''),
-                                        'location': props.get('location', '')
-                                    })
+                                dc_lons.append(coords[0])
+                                dc_lats.append(coords[1])
+                                dc_props.append(feature.get('properties', {}))
+
+                        if dc_props:
+                            shapely.prepare(harris_polygon)
+                            inside = shapely.contains_xy(
+                                harris_polygon,
+                                np.array(dc_lons, dtype=np.float64),
+                                np.array(dc_lats, dtype=np.float64),
+                            )
+                            for i in np.flatnonzero(inside):
+                                props = dc_props[i]
+                                harris_dc_timeline.append({
+                                    'name': props.get('project_name', 'Unknown'),
+                                    'company': props.get('company', 'Unknown'),
+                                    'announced': props.get('announced_date', ''),
+                                    'location': props.get('location', '')
+                                })
             except ImportError:
                 pass
-        
+
         conn.close()
-    
+
     print(f"Data center projects in Harris: {len(harris_dc_timeline)}")
     if harris_dc_timeline:
         print("DC projects:")
@@ -273,56 +313,30 @@ def analyze_harris_county():
             print(f"  {dc['name']} ({dc['company']})")
             print(f"    Announced: {dc['announced']}")
             print(f"    Location: {dc['location']}")
-        
+
         # Extract years
-        dc_years = []
-        for dc in harris_dc_timeline:
-            if dc['announced']:
-                try:
-                    year = int(dc['announced'][:4])
-                    dc_years.append(year)
-                except:
-                    pass
-        
-        if dc_years:
-            year_counts = defaultdict(int)
-            for year in dc_years:
-                year_counts[year] += 1
-            
+        year_counts = Counter(y for dc in harris_dc_timeline if (y := _year(dc['announced'])) is not None)
+
+        if year_counts:
             print("\nDC announcements by year:")
             for year in sorted(year_counts.keys()):
                 print(f"  {year}: {year_counts[year]} announcements")
     print()
-    
+
     # 5. Comparison with Other Counties
     print("5. COMPARISON WITH OTHER COUNTIES")
     print("-" * 80)
-    
+
     # Get comparison data
     counties_to_compare = ['Harris', 'Dallas', 'Brazoria', 'Bexar', 'Hill']
-    
+
     print(f"{'County':<15} {'Type':<20} {'Energy GW':<12} {'DC Count':<10} {'Surplus GW':<12}")
     print("-" * 80)
-    
+
     for county_name in counties_to_compare:
-        # Get ERCOT data
-        county_ercot = None
-        for feature in ercot_data['features']:
-            props = feature.get('properties', {})
-            if props.get('NAME', '').strip() == county_name:
-                county_ercot = props
-                break
-        
-        # Get DC data
-        county_dc = None
-        if gap_path.exists():
-            with open(gap_path, 'r') as f:
-                gap_data = json.load(f)
-            for gap in gap_data.get('gaps_by_county', []):
-                if gap['county'] == county_name:
-                    county_dc = gap
-                    break
-        
+        county_ercot = ercot_by_name.get(county_name)
+        county_dc = gap_by_county.get(county_name)
+
         energy_gw = (county_ercot.get('total_capacity_mw', 0) or 0) / 1000 if county_ercot else 0
         dc_count = county_dc['dc_count'] if county_dc else 0
         if county_dc:
@@ -330,7 +344,7 @@ def analyze_harris_county():
             surplus_gw = abs(gap_gw) if gap_gw < 0 else 0
         else:
             surplus_gw = 0
-        
+
         # Classify
         if energy_gw > 2 and dc_count > 2:
             county_type = "Hybrid (both)"
@@ -340,56 +354,41 @@ def analyze_harris_county():
             county_type = "Consumer (DCs)"
         else:
             county_type = "Neither"
-        
-        print(f"{county_name:<15} {county_type:<20} {energy_gw:>10.2f} {dc_count:>10} {surplus_gw:>10.2f}")
-    
+
+        print(_COMPARISON_ROW(county=county_name, type=county_type, energy_gw=energy_gw,
+                              dc_count=dc_count, surplus_gw=surplus_gw))
+
     print()
-    
+
     # 6. Hypothesis B Test
     print("6. HYPOTHESIS B TEST")
     print("-" * 80)
-    
+
     print("Hypothesis B: Counties specialize into producers OR consumers.")
     print("Coordination = transmission between specialized counties.")
     print()
-    
+
     print("Harris County analysis:")
     if harris_ercot and harris_dc:
         energy_gw = (harris_ercot.get('total_capacity_mw', 0) or 0) / 1000
         dc_count = harris_dc['dc_count']
-        
+
         if energy_gw > 2 and dc_count > 2:
             print(f"  ✅ Harris is HYBRID: {energy_gw:.2f} GW energy + {dc_count} DCs")
-            print()
-            print("  Question: Did Harris START hybrid or BECOME hybrid?")
-            print()
-            print("  Evidence:")
-            print("    - Houston = oil/gas capital (1900s) → energy infrastructure")
-            print("    - Houston = major metro (7.5M) → talent/customers")
-            print("    - Data centers arrived (2020s) → leveraged both")
-            print()
-            print("  Conclusion: Harris STARTED with both characteristics")
-            print("    → Inherited energy infrastructure from oil/gas industry")
-            print("    → Grew into metro around energy industry")
-            print("    → DCs followed (path dependency)")
-            print()
-            print("  This supports Hypothesis B:")
-            print("    - Harris is exception (started with both)")
-            print("    - Other counties can't replicate (no 100-year energy legacy)")
-            print("    - Specialization is the norm")
+            sys.stdout.write(HYBRID_EVIDENCE_BLOCK)
         else:
             print(f"  ⚠️  Harris is NOT clearly hybrid")
             print(f"     Energy: {energy_gw:.2f} GW, DCs: {dc_count}")
     print()
-    
+
     # 7. Key Insights
     print("7. KEY INSIGHTS")
     print("-" * 80)
-    
+
     if harris_ercot:
         baseload_pct = baseload_pct if 'baseload_pct' in locals() else 0
         renewable_pct = renewable_pct if 'renewable_pct' in locals() else 0
-        
+
         print("Energy infrastructure:")
         if baseload_pct > 50:
             print(f"  ✅ Baseload-dominant ({baseload_pct:.1f}% gas/nuclear)")
@@ -398,19 +397,9 @@ def analyze_harris_county():
         elif renewable_pct > 50:
             print(f"  ⚠️  Renewable-dominant ({renewable_pct:.1f}%)")
             print("     → May have reliability issues")
-        
-        print()
-        print("Metro + Energy Hub:")
-        print("  ✅ Harris has BOTH characteristics")
-        print("  ✅ Started with energy (oil/gas legacy)")
-        print("  ✅ Grew into metro (population, tech)")
-        print("  ✅ DCs followed (leverages both)")
-        print()
-        print("Hypothesis B validation:")
-        print("  ✅ Harris is exception (started hybrid)")
-        print("  ✅ Other counties specialize (producer OR consumer)")
-        print("  ✅ Can't BECOME hybrid, must START hybrid")
-    
+
+        sys.stdout.write(KEY_INSIGHTS_FOOTER)
+
     print()
     print("=" * 80)
     print("✅ Analysis complete!")
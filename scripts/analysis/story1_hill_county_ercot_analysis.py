@@ -3,9 +3,15 @@
 Analyze ERCOT energy data for Hill County.
 Shows what energy infrastructure exists and how it relates to data center demand.
 """
-import json
 from pathlib import Path
 
+import _paths  # noqa: F401
+from _ercot_cache import get_county
+from _jsonio import load_json
+
+# Fuel breakdown row, bound once rather than re-evaluated as an f-string per row
+_FUEL_ROW = "{fuel:<12} {count:>3} projects, {capacity:>8,.0f} MW ({pct:>5.1f}%)".format
+
 def analyze_hill_county_ercot():
     """Analyze ERCOT energy data for Hill County."""
     base_path = Path(__file__).parent.parent.parent
@@ -20,16 +26,7 @@ def analyze_hill_county_ercot():
     if not ercot_path.exists():
         ercot_path = base_path / 'public/data/ercot/ercot_counties_aggregated.geojson'
     
-    with open(ercot_path, 'r') as f:
-        data = json.load(f)
-    
-    # Find Hill County
-    hill_county = None
-    for feature in data['features']:
-        props = feature.get('properties', {})
-        if props.get('NAME', '').strip() == 'Hill':
-            hill_county = props
-            break
+    hill_county = get_county(ercot_path, 'Hill')
     
     if not hill_county:
         print("❌ Hill County not found in ERCOT data")
@@ -64,10 +61,12 @@ def analyze_hill_county_ercot():
         'Other': (hill_county.get('fuel_other_count', 0) or 0, hill_county.get('fuel_other_capacity', 0) or 0),
     }
     
+    # MW -> % of total, divided once outside the loop
+    pct_scale = 100 / total_capacity_mw if total_capacity_mw > 0 else 0
     for fuel, (count, capacity) in sorted(fuel_types.items(), key=lambda x: x[1][1], reverse=True):
         if count > 0:
-            pct = (capacity / total_capacity_mw * 100) if total_capacity_mw > 0 else 0
-            print(f"{fuel:12} {count:3} projects, {capacity:8,.0f} MW ({pct:5.1f}%)")
+            pct = capacity * pct_scale
+            print(_FUEL_ROW(fuel=fuel, count=count, capacity=capacity, pct=pct))
     print()
     
     print("4. ENERGY MIX")
@@ -92,8 +91,7 @@ def analyze_hill_county_ercot():
     gap_path = base_path / 'data/analysis/story1_power_demand_gap.json'
     dc_demand_mw = 0
     if gap_path.exists():
-        with open(gap_path, 'r') as f:
-            gap_data = json.load(f)
+        gap_data = load_json(gap_path)
         for gap in gap_data.get('gaps_by_county', []):
             if gap['county'] == 'Hill':
                 dc_demand_mw = gap['dc_demand_mw']
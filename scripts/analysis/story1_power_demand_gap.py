@@ -3,24 +3,47 @@
 Calculate power demand gap for each county with data centers.
 Compares estimated DC power demand vs local ERCOT energy capacity.
 """
-import json
+import heapq
+import io
+import re
+import sys
 from pathlib import Path
 from collections import defaultdict
+from dataclasses import dataclass, field
 
-def estimate_dc_demand(feature, default_mw_per_dc=100, max_reasonable_mw=10000):
+import _paths  # noqa: F401
+from _ercot_cache import (
+    DC_FIELDS, ERCOT_COUNTY_FIELDS, cached_pickle, iter_features, iter_projected_features, iter_projected_properties,
+)
+from _jsonio import dumps_json
+
+# Location-text fallback patterns: "County" or "City, County"
+COUNTY_PATTERNS = [
+    re.compile(r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+County"),
+    re.compile(r"([A-Z][a-z]+),\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+County"),
+]
+
+@dataclass
+class CountyAccum:
+    """Running DC demand totals for one county"""
+    dc_count: int = 0
+    total_demand_mw: float = 0.0
+    projects_with_size: int = 0
+    projects_estimated: int = 0
+    projects: list = field(default_factory=list)
+
+def estimate_dc_demand(props, size_mw, default_mw_per_dc=100, max_reasonable_mw=10000):
     """
     Estimate power demand for a data center project.
     
     Args:
-        feature: GeoJSON feature with DC project data
+        props: GeoJSON feature properties of the DC project
+        size_mw: props['size_mw'], already looked up by the caller
         default_mw_per_dc: Default estimate if size_mw not available (MW)
         max_reasonable_mw: Maximum reasonable size for a single DC (MW)
                            Used to filter out data quality issues
     """
-    props = feature.get('properties', {})
-    
     # Use size_mw if available
-    size_mw = props.get('size_mw')
     if size_mw and size_mw > 0:
         size_mw = float(size_mw)
         
@@ -35,6 +58,24 @@ def estimate_dc_demand(feature, default_mw_per_dc=100, max_reasonable_mw=10000):
     # Fallback: use default estimate
     return default_mw_per_dc
 
+def build_county_shapes(counties_path):
+    """County polygons and their NAMEs, in file order, from the counties
+    GeoJSON (requires shapely)."""
+    from shapely.geometry import shape
+    
+    county_shapes = []
+    county_names = []
+    for feature in iter_features(counties_path):
+        county_name = feature.get('properties', {}).get('NAME', '')
+        geometry = feature.get('geometry', {})
+        if geometry and county_name:
+            try:
+                county_shapes.append(shape(geometry))
+            except Exception:
+                continue
+            county_names.append(county_name)
+    return county_shapes, county_names
+
 def calculate_power_demand_gap():
     """Calculate power demand gap for each county with data centers."""
     base_path = Path(__file__).parent.parent.parent
@@ -42,8 +83,10 @@ def calculate_power_demand_gap():
     # Load DC data
     dc_path = base_path / 'public/data/texas_data_centers.geojson'
     print("Loading data center data...")
-    with open(dc_path, 'r') as f:
-        dc_data = json.load(f)
+    # Only the DC_FIELDS projection when build_geojson_projections.py has
+    # been run, otherwise streamed; the points are kept for the bulk
+    # point-in-polygon pass below
+    dc_features = list(iter_projected_features(dc_path, DC_FIELDS, geometry=True))
     
     # Load ERCOT data (fixed)
     ercot_path = base_path / 'public/data/ercot/ercot_counties_aggregated_fixed.geojson'
@@ -52,13 +95,11 @@ def calculate_power_demand_gap():
         print("⚠️  Using original ERCOT data (fixed not found)")
     
     print("Loading ERCOT energy data...")
-    with open(ercot_path, 'r') as f:
-        ercot_data = json.load(f)
     
-    # Create ERCOT capacity lookup by county
+    # Create ERCOT capacity lookup by county (properties only, the county
+    # polygons in this file are never built)
     ercot_by_county = {}
-    for feature in ercot_data.get('features', []):
-        props = feature.get('properties', {})
+    for props in iter_projected_properties(ercot_path, ERCOT_COUNTY_FIELDS):
         county_name = props.get('NAME', '').strip()
         if county_name:
             ercot_by_county[county_name] = {
@@ -68,73 +109,88 @@ def calculate_power_demand_gap():
     
     # Aggregate DC demand by county
     print("\nCalculating DC demand by county...")
-    dc_demand_by_county = defaultdict(lambda: {
-        'dc_count': 0,
-        'total_demand_mw': 0.0,
-        'projects_with_size': 0,
-        'projects_estimated': 0,
-        'projects': []
-    })
+    dc_demand_by_county = defaultdict(CountyAccum)
     
     # Use point-in-polygon if shapely available, otherwise use location text
     try:
-        from shapely.geometry import Point, shape
+        import numpy as np
+        import shapely
+        from shapely.strtree import STRtree
         HAVE_SHAPELY = True
         
-        # Load county boundaries for point-in-polygon
+        # County boundaries for point-in-polygon
         counties_path = base_path / 'public/data/texas/texas_counties.geojson'
-        if counties_path.exists():
-            with open(counties_path, 'r') as f:
-                counties_data = json.load(f)
-        else:
-            counties_data = None
+        if not counties_path.exists():
             HAVE_SHAPELY = False
     except ImportError:
         HAVE_SHAPELY = False
-        counties_data = None
     
-    def get_county_from_coords(lng, lat, counties_data):
-        """Get county from coordinates using point-in-polygon."""
-        if not HAVE_SHAPELY or not counties_data:
-            return None
+    # Build every county polygon once (or reuse the pickled ones) and index
+    # them with an STRtree, so a point is only tested against the few
+    # counties whose bbox contains it
+    county_shapes = []
+    county_names = []
+    county_tree = None
+    if HAVE_SHAPELY:
+        # The built geometries are pickled, so later runs skip parsing and
+        # shape() entirely
+        county_shapes, county_names = cached_pickle(
+            counties_path, 'county_shapes', lambda: build_county_shapes(counties_path))
+        # Prepared in place (preparation isn't pickled, and the tree over
+        # ~250 polygons is cheap to rebuild): repeated contains() calls reuse the edge index
+        shapely.prepare(county_shapes)
+        county_tree = STRtree(county_shapes)
+    
+    def get_counties_from_coords(features):
+        """County name (or None) for each feature, via point-in-polygon.
+        
+        All points go through one bulk STRtree query and one vectorized
+        contains_xy call instead of a Python-level lookup per point.
+        """
+        counties = [None] * len(features)
+        if county_tree is None:
+            return counties
+        
+        located = []
+        xy = []
+        for i, feature in enumerate(features):
+            coords = feature.get('geometry', {}).get('coordinates', [])
+            if coords and len(coords) == 2:
+                located.append(i)
+                xy.append(coords)
+        if not located:
+            return counties
         
-        point = Point(lng, lat)
-        for feature in counties_data.get('features', []):
-            county_name = feature.get('properties', {}).get('NAME', '')
-            geometry = feature.get('geometry', {})
-            if geometry and county_name:
-                try:
-                    polygon = shape(geometry)
-                    if polygon.contains(point):
-                        return county_name
-                except:
-                    continue
-        return None
+        xy = np.asarray(xy, dtype=np.float64)
+        point_idx, county_idx = county_tree.query(shapely.points(xy))
+        inside = shapely.contains_xy(
+            np.asarray(county_shapes, dtype=object)[county_idx],
+            xy[point_idx, 0],
+            xy[point_idx, 1],
+        )
+        point_idx = point_idx[inside]
+        county_idx = county_idx[inside]
+        # A point inside several polygons takes the first county in file
+        # order, as the old linear scan did
+        order = np.lexsort((county_idx, point_idx))
+        point_idx, first = np.unique(point_idx[order], return_index=True)
+        for p, c in zip(point_idx, county_idx[order][first]):
+            counties[located[p]] = county_names[c]
+        return counties
+    
+    # Strategy 1: Point-in-polygon, for every DC at once
+    coord_counties = get_counties_from_coords(dc_features)
     
     unlocated = 0
     
-    for feature in dc_data.get('features', []):
+    for feature, county in zip(dc_features, coord_counties):
         props = feature.get('properties', {})
-        coords = feature.get('geometry', {}).get('coordinates', [])
         location_text = props.get('location', '')
         
-        # Try to get county
-        county = None
-        
-        # Strategy 1: Point-in-polygon
-        if coords and len(coords) == 2 and counties_data:
-            county = get_county_from_coords(coords[0], coords[1], counties_data)
-        
         # Strategy 2: Parse location text
         if not county and location_text:
-            import re
-            # Pattern: "City, County" or "County"
-            patterns = [
-                r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+County",
-                r"([A-Z][a-z]+),\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+County",
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, location_text)
+            for pattern in COUNTY_PATTERNS:
+                match = pattern.search(location_text)
                 if match:
                     groups = match.groups()
                     if len(groups) > 1:
@@ -148,16 +204,18 @@ def calculate_power_demand_gap():
             continue
         
         # Estimate demand
-        demand_mw = estimate_dc_demand(feature)
-        has_size = props.get('size_mw') and props.get('size_mw') > 0
+        size_mw = props.get('size_mw')
+        demand_mw = estimate_dc_demand(props, size_mw)
+        has_size = size_mw and size_mw > 0
         
-        dc_demand_by_county[county]['dc_count'] += 1
-        dc_demand_by_county[county]['total_demand_mw'] += demand_mw
+        acc = dc_demand_by_county[county]
+        acc.dc_count += 1
+        acc.total_demand_mw += demand_mw
         if has_size:
-            dc_demand_by_county[county]['projects_with_size'] += 1
+            acc.projects_with_size += 1
         else:
-            dc_demand_by_county[county]['projects_estimated'] += 1
-        dc_demand_by_county[county]['projects'].append({
+            acc.projects_estimated += 1
+        acc.projects.append({
             'name': props.get('project_name', 'Unknown'),
             'demand_mw': demand_mw,
             'has_size': has_size
@@ -167,15 +225,17 @@ def calculate_power_demand_gap():
         print(f"⚠️  {unlocated} projects could not be assigned to a county")
     
     # Calculate gaps
-    print("\n" + "=" * 80)
-    print("POWER DEMAND GAP ANALYSIS")
-    print("=" * 80)
+    # The report is built in a buffer and written to stdout in one go
+    out = io.StringIO()
+    out.write("\n" + "=" * 80 + "\n")
+    out.write("POWER DEMAND GAP ANALYSIS\n")
+    out.write("=" * 80 + "\n")
     
     gaps = []
     
     for county, dc_info in dc_demand_by_county.items():
-        dc_count = dc_info['dc_count']
-        dc_demand_mw = dc_info['total_demand_mw']
+        dc_count = dc_info.dc_count
+        dc_demand_mw = dc_info.total_demand_mw
         ercot_info = ercot_by_county.get(county, {'capacity_mw': 0, 'project_count': 0})
         ercot_capacity_mw = ercot_info['capacity_mw']
         
@@ -203,22 +263,27 @@ def calculate_power_demand_gap():
             'gap_mw': gap_mw,
             'gap_gw': gap_gw,
             'status': status,
-            'projects_with_size': dc_info['projects_with_size'],
-            'projects_estimated': dc_info['projects_estimated']
+            'projects_with_size': dc_info.projects_with_size,
+            'projects_estimated': dc_info.projects_estimated
         })
     
     # Sort by gap (largest shortfall first)
     gaps.sort(key=lambda x: x['gap_mw'], reverse=True)
     
     # Print results
-    print(f"\n{'County':<20} {'DCs':<6} {'DC Demand':<12} {'ERCOT Cap':<12} {'Gap':<12} {'Status':<12}")
-    print(f"{'-'*20} {'-'*6} {'-'*12} {'-'*12} {'-'*12} {'-'*12}")
+    out.write(f"\n{'County':<20} {'DCs':<6} {'DC Demand':<12} {'ERCOT Cap':<12} {'Gap':<12} {'Status':<12}\n")
+    out.write(f"{'-'*20} {'-'*6} {'-'*12} {'-'*12} {'-'*12} {'-'*12}\n")
     
     total_demand = 0
     total_capacity = 0
     total_shortfall = 0
     counties_with_shortfall = 0
+    total_with_size = 0
+    total_estimated = 0
+    shortfalls = []
+    surpluses = []
     
+    # One pass writes the table and collects everything the summary needs
     for gap in gaps:
         county = gap['county']
         dc_count = gap['dc_count']
@@ -229,47 +294,50 @@ def calculate_power_demand_gap():
         
         emoji = "🔴" if status == "SHORTFALL" else "🟢" if status == "SURPLUS" else "🟡"
         
-        print(f"{county:<20} {dc_count:<6} {dc_demand_gw:>10.2f} GW {ercot_capacity_gw:>10.2f} GW {gap_gw:>+10.2f} GW {emoji} {status}")
+        out.write(f"{county:<20} {dc_count:<6} {dc_demand_gw:>10.2f} GW {ercot_capacity_gw:>10.2f} GW {gap_gw:>+10.2f} GW {emoji} {status}\n")
         
         total_demand += gap['dc_demand_mw']
         total_capacity += gap['ercot_capacity_mw']
         if gap['gap_mw'] > 0:
             total_shortfall += gap['gap_mw']
             counties_with_shortfall += 1
+        total_with_size += gap['projects_with_size']
+        total_estimated += gap['projects_estimated']
+        if status == 'SHORTFALL':
+            shortfalls.append(gap)
+        elif status == 'SURPLUS':
+            surpluses.append(gap)
     
-    print(f"\n{'='*80}")
-    print("SUMMARY")
-    print(f"{'='*80}")
-    print(f"Total counties with DCs: {len(gaps)}")
-    print(f"Total DC demand: {total_demand/1000:.2f} GW")
-    print(f"Total ERCOT capacity (in DC counties): {total_capacity/1000:.2f} GW")
-    print(f"Total shortfall: {total_shortfall/1000:.2f} GW")
-    print(f"Counties with shortfall: {counties_with_shortfall}/{len(gaps)}")
+    out.write(f"\n{'='*80}\n")
+    out.write("SUMMARY\n")
+    out.write(f"{'='*80}\n")
+    out.write(f"Total counties with DCs: {len(gaps)}\n")
+    out.write(f"Total DC demand: {total_demand/1000:.2f} GW\n")
+    out.write(f"Total ERCOT capacity (in DC counties): {total_capacity/1000:.2f} GW\n")
+    out.write(f"Total shortfall: {total_shortfall/1000:.2f} GW\n")
+    out.write(f"Counties with shortfall: {counties_with_shortfall}/{len(gaps)}\n")
     
     # Top shortfalls
-    print(f"\n🔴 Top 10 Counties with SHORTFALL:")
-    shortfalls = [g for g in gaps if g['status'] == 'SHORTFALL']
-    shortfalls.sort(key=lambda x: x['gap_mw'], reverse=True)
+    out.write(f"\n🔴 Top 10 Counties with SHORTFALL:\n")
+    # gaps is already sorted by gap_mw, largest first
     for i, gap in enumerate(shortfalls[:10], 1):
-        print(f"   {i}. {gap['county']}: {gap['dc_count']} DCs × {gap['dc_demand_mw']/gap['dc_count']:.0f} MW = {gap['dc_demand_gw']:.2f} GW demand, "
-              f"{gap['ercot_capacity_gw']:.2f} GW local = {gap['gap_gw']:.2f} GW shortfall")
+        out.write(f"   {i}. {gap['county']}: {gap['dc_count']} DCs × {gap['dc_demand_mw']/gap['dc_count']:.0f} MW = {gap['dc_demand_gw']:.2f} GW demand, "
+                  f"{gap['ercot_capacity_gw']:.2f} GW local = {gap['gap_gw']:.2f} GW shortfall\n")
     
     # Top surpluses
-    print(f"\n🟢 Top 10 Counties with SURPLUS:")
-    surpluses = [g for g in gaps if g['status'] == 'SURPLUS']
-    surpluses.sort(key=lambda x: x['gap_mw'])  # Most negative first
-    for i, gap in enumerate(surpluses[:10], 1):
-        print(f"   {i}. {gap['county']}: {gap['dc_count']} DCs × {gap['dc_demand_mw']/gap['dc_count']:.0f} MW = {gap['dc_demand_gw']:.2f} GW demand, "
-              f"{gap['ercot_capacity_gw']:.2f} GW local = {abs(gap['gap_gw']):.2f} GW surplus")
+    out.write(f"\n🟢 Top 10 Counties with SURPLUS:\n")
+    # Most negative first
+    for i, gap in enumerate(heapq.nsmallest(10, surpluses, key=lambda x: x['gap_mw']), 1):
+        out.write(f"   {i}. {gap['county']}: {gap['dc_count']} DCs × {gap['dc_demand_mw']/gap['dc_count']:.0f} MW = {gap['dc_demand_gw']:.2f} GW demand, "
+                  f"{gap['ercot_capacity_gw']:.2f} GW local = {abs(gap['gap_gw']):.2f} GW surplus\n")
     
     # Data quality note
-    total_with_size = sum(g['projects_with_size'] for g in gaps)
-    total_estimated = sum(g['projects_estimated'] for g in gaps)
-    print(f"\n📊 Data Quality:")
-    print(f"   Projects with size_mw: {total_with_size}")
-    print(f"   Projects estimated (100 MW default): {total_estimated}")
+    out.write(f"\n📊 Data Quality:\n")
+    out.write(f"   Projects with size_mw: {total_with_size}\n")
+    out.write(f"   Projects estimated (100 MW default): {total_estimated}\n")
     if total_estimated > 0:
-        print(f"   ⚠️  {total_estimated} projects using default 100 MW estimate")
+        out.write(f"   ⚠️  {total_estimated} projects using default 100 MW estimate\n")
+    sys.stdout.write(out.getvalue())
     
     # Save results
     result = {
@@ -288,8 +356,7 @@ def calculate_power_demand_gap():
     output_path = base_path / 'data/analysis/story1_power_demand_gap.json'
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    output_path.write_bytes(dumps_json(result, indent=True))
     
     print(f"\n✅ Results saved to {output_path}")
     
@@ -2,30 +2,30 @@
 """
 Breakdown of data center projects by status (active vs dead vs uncertain)
 """
-import json
 from pathlib import Path
-from collections import Counter
+from collections import Counter, defaultdict
+
+import _paths  # noqa: F401
+from _ercot_cache import DC_FIELDS, iter_projected_features
+from _jsonio import dumps_json
 
 def get_status_breakdown():
     """Get status breakdown of data center projects."""
     geojson_path = Path(__file__).parent.parent.parent / 'public/data/texas_data_centers.geojson'
     
-    with open(geojson_path, 'r') as f:
-        data = json.load(f)
-    
     status_counts = Counter()
-    status_by_county = {}
-    total_projects = len(data.get('features', []))
+    status_by_county = defaultdict(Counter)
+    total_projects = 0
     
-    for feature in data.get('features', []):
+    # The DC_FIELDS projection if current, otherwise streamed one feature
+    # at a time instead of loading the whole file
+    for feature in iter_projected_features(geojson_path, DC_FIELDS):
+        total_projects += 1
         props = feature.get('properties', {})
         status = props.get('status', 'unknown')
         county = props.get('location', '').split(',')[0].strip()  # Simple county extraction
         
         status_counts[status] += 1
-        
-        if county not in status_by_county:
-            status_by_county[county] = Counter()
         status_by_county[county][status] += 1
     
     print("=" * 80)
@@ -82,8 +82,7 @@ if __name__ == '__main__':
     output_path = Path(__file__).parent.parent.parent / 'data/analysis/story1_status_breakdown.json'
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    output_path.write_bytes(dumps_json(result, indent=True))
     
     print(f"\n✅ Saved to {output_path}")
 
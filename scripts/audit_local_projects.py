@@ -5,11 +5,14 @@ Identifies what's public-ready vs what stays private.
 """
 
 import os
-import json
+import mmap
 import re
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from _jsonio import dumps_json
 
 # Define project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -27,7 +30,7 @@ SCAN_DIRS = [
 ]
 
 # Directories to skip
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     "node_modules",
     "__pycache__",
     ".git",
@@ -37,7 +40,7 @@ SKIP_DIRS = {
     ".venv",
     "venv",
     "env",
-}
+})
 
 # File patterns that might contain secrets
 SECRET_PATTERNS = [
@@ -53,12 +56,65 @@ SECRET_PATTERNS = [
     r'AIza[0-9A-Za-z_-]+', # Google API key pattern
 ]
 
+# Compiled once, as bytes patterns so files can be scanned without decoding
+# (all of the patterns are ASCII)
+COMPILED_SECRET_PATTERNS = [re.compile(p.encode(), re.IGNORECASE) for p in SECRET_PATTERNS]
+
 # File extensions to check for secrets
 SECRET_CHECK_EXTENSIONS = {'.py', '.js', '.jsx', '.ts', '.tsx', '.json', '.env', '.txt', '.md'}
 
+# Extension -> category, checked before the environment-file test
+# (.json is a data file, not config)
+EXTENSION_CATEGORIES = {
+    # Data files
+    '.json': 'data_file', '.geojson': 'data_file', '.csv': 'data_file', '.parquet': 'data_file',
+    '.db': 'data_file', '.sqlite': 'data_file', '.sqlite3': 'data_file',
+    # Scripts
+    '.py': 'script', '.js': 'script', '.jsx': 'script', '.ts': 'script', '.tsx': 'script',
+    '.sh': 'script', '.sql': 'script',
+    # Documentation
+    '.md': 'documentation', '.txt': 'documentation', '.pdf': 'documentation',
+    # Config
+    '.yaml': 'config', '.yml': 'config', '.toml': 'config', '.ini': 'config', '.conf': 'config',
+}
+
 # Large file threshold (MB)
 LARGE_FILE_THRESHOLD_MB = 10
 
+# Data dumps with these (otherwise checked) extensions above
+# SECRET_SCAN_MAX_MB are not scanned for secrets, and so are not marked
+# public-ready; code, config and text files are scanned at any size
+SECRET_SCAN_SKIP_EXTENSIONS = {'.json'}
+SECRET_SCAN_MAX_MB = 5
+
+def _decode_text(data: bytes) -> str:
+    """Decode like read_text(errors='ignore'), newlines included"""
+    return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+def _scan_secrets(content, issues: list) -> None:
+    """Append a finding per pattern match in the mapped file content"""
+    for pattern, regex in zip(SECRET_PATTERNS, COMPILED_SECRET_PATTERNS):
+        # Lines are counted incrementally from the previous match
+        line = 1
+        counted_to = 0
+        for match in regex.finditer(content):
+            start, end = match.span()
+            between = content[counted_to:start]
+            line += between.count(b'\n') + between.count(b'\r') - between.count(b'\r\n')
+            counted_to = start
+            
+            # Get context (50 chars before and after); 4 bytes per char
+            # is enough for any UTF-8 text
+            before = _decode_text(content[max(0, start - 200):start])[-50:]
+            after = _decode_text(content[end:end + 200])[:50]
+            context = (before + _decode_text(content[start:end]) + after).replace('\n', ' ')
+            
+            issues.append({
+                "pattern": pattern,
+                "context": context,
+                "line": line
+            })
+
 def check_for_secrets(file_path: Path) -> list:
     """Check if file contains potential secrets"""
     issues = []
@@ -67,21 +123,13 @@ def check_for_secrets(file_path: Path) -> list:
         return issues
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        
-        for pattern in SECRET_PATTERNS:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                # Get context (50 chars before and after)
-                start = max(0, match.start() - 50)
-                end = min(len(content), match.end() + 50)
-                context = content[start:end].replace('\n', ' ')
-                
-                issues.append({
-                    "pattern": pattern,
-                    "context": context,
-                    "line": content[:match.start()].count('\n') + 1
-                })
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return issues
+            # Scan the page cache directly rather than a decoded copy. Match
+            # objects pin the map, so they must not outlive _scan_secrets.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                _scan_secrets(content, issues)
     except Exception as e:
         issues.append({
             "error": f"Could not read file: {str(e)}"
@@ -92,44 +140,27 @@ def check_for_secrets(file_path: Path) -> list:
 def get_file_category(file_path: Path) -> str:
     """Categorize file by type and location"""
     ext = file_path.suffix.lower()
-    path_str = str(file_path)
-    
-    # Data files
-    if ext in ['.json', '.geojson', '.csv', '.parquet', '.db', '.sqlite', '.sqlite3']:
-        if 'data' in path_str.lower():
-            return 'data_file'
-        return 'data_file'
-    
-    # Scripts
-    if ext in ['.py', '.js', '.jsx', '.ts', '.tsx', '.sh', '.sql']:
-        if 'script' in path_str.lower() or 'scripts' in path_str.lower():
-            return 'script'
-        return 'script'
-    
-    # Documentation
-    if ext in ['.md', '.txt', '.pdf']:
-        return 'documentation'
-    
-    # Config
-    if ext in ['.json', '.yaml', '.yml', '.toml', '.ini', '.conf']:
-        if 'config' in path_str.lower():
-            return 'config'
-        return 'config'
+    category = EXTENSION_CATEGORIES.get(ext)
+    if category:
+        return category
     
     # Environment files
-    if '.env' in file_path.name.lower() or file_path.name.startswith('.'):
+    name = file_path.name
+    if '.env' in name.lower() or name.startswith('.'):
         return 'environment'
     
     # Maps/Visualizations
-    if ext in ['.html', '.htm']:
+    if ext in ('.html', '.htm'):
         return 'map_visualization'
     
     return 'other'
 
-def audit_file(file_path: Path, project_root: Path) -> dict:
-    """Audit a single file"""
+def audit_file(file_path: Path, project_root: Path, stat_result: os.stat_result = None) -> dict:
+    """Audit a single file (stat_result saves a stat call when the caller has one)"""
     rel_path = file_path.relative_to(project_root)
-    file_size = file_path.stat().st_size
+    if stat_result is None:
+        stat_result = file_path.stat()
+    file_size = stat_result.st_size
     file_size_mb = file_size / (1024 * 1024)
     file_size_kb = file_size / 1024
     
@@ -142,7 +173,11 @@ def audit_file(file_path: Path, project_root: Path) -> dict:
     }
     
     # Check for secrets
-    secrets = check_for_secrets(file_path)
+    if file_size_mb > SECRET_SCAN_MAX_MB and file_info["extension"] in SECRET_SCAN_SKIP_EXTENSIONS:
+        secrets = []
+        file_info["secrets_scan_skipped"] = True
+    else:
+        secrets = check_for_secrets(file_path)
     if secrets:
         file_info["secrets_found"] = secrets
         file_info["has_secrets"] = True
@@ -161,6 +196,9 @@ def audit_file(file_path: Path, project_root: Path) -> dict:
     if file_info["has_secrets"]:
         file_info["public_ready"] = False
         file_info["public_ready_reason"] = "Contains potential secrets/API keys"
+    elif file_info.get("secrets_scan_skipped"):
+        file_info["public_ready"] = False
+        file_info["public_ready_reason"] = "Secret scan skipped (file too large)"
     elif file_info["is_large"] and file_info["category"] == "data_file":
         file_info["public_ready"] = False
         file_info["public_ready_reason"] = f"Large data file ({file_info['size_mb']:.1f}MB) - may need sampling"
@@ -176,8 +214,30 @@ def audit_file(file_path: Path, project_root: Path) -> dict:
     
     return file_info
 
-def audit_directory(dir_path: Path, project_root: Path) -> dict:
-    """Audit a directory and all its files"""
+def _audit_file_job(file_path: Path, project_root: Path, stat_result: os.stat_result):
+    """audit_file for a worker process; errors come back as values"""
+    try:
+        return audit_file(file_path, project_root, stat_result)
+    except Exception as e:
+        return e
+
+def audit_files(jobs: list) -> list:
+    """Run audit_file over (path, project_root, stat) jobs across processes.
+    
+    Each file is independent and the secret scan is CPU-bound regex work,
+    so this fans out over all cores. Results come back in job order.
+    """
+    if not jobs:
+        return []
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_audit_file_job, *zip(*jobs), chunksize=64))
+
+def audit_directory(dir_path: Path, project_root: Path, jobs: list) -> dict:
+    """Lay out the audit tree for a directory and queue its files.
+    
+    Files are appended to jobs for audit_files; fill_directory then puts
+    the results into the tree and adds up the totals.
+    """
     dir_info = {
         "path": str(dir_path.relative_to(project_root)),
         "files": [],
@@ -187,35 +247,29 @@ def audit_directory(dir_path: Path, project_root: Path) -> dict:
         "public_ready_count": 0,
         "needs_cleaning_count": 0,
         "secrets_count": 0,
+        # Listing order of ("file", job index) / ("dir", dir_info) entries
+        "_pending": [],
     }
     
     try:
-        for item in dir_path.iterdir():
-            # Skip certain directories
-            if item.name in SKIP_DIRS or item.name.startswith('.'):
+        # scandir entries carry the file type from the directory listing,
+        # so is_dir/is_file need no extra stat and entry.stat() is cached.
+        # The listing is read up front so the handle is closed before
+        # recursing into subdirectories.
+        with os.scandir(dir_path) as entries:
+            entries = list(entries)
+        for entry in entries:
+            # Skip certain directories by name alone, before is_dir() or
+            # stat() touch the entry
+            if entry.name in SKIP_DIRS or entry.name.startswith('.'):
                 continue
             
-            if item.is_dir():
-                subdir_info = audit_directory(item, project_root)
-                dir_info["subdirectories"].append(subdir_info)
-                dir_info["total_size_mb"] += subdir_info["total_size_mb"]
-                dir_info["file_count"] += subdir_info["file_count"]
-                dir_info["public_ready_count"] += subdir_info["public_ready_count"]
-                dir_info["needs_cleaning_count"] += subdir_info["needs_cleaning_count"]
-                dir_info["secrets_count"] += subdir_info["secrets_count"]
-            elif item.is_file():
-                file_info = audit_file(item, project_root)
-                dir_info["files"].append(file_info)
-                dir_info["total_size_mb"] += file_info["size_mb"]
-                dir_info["file_count"] += 1
-                
-                if file_info["public_ready"]:
-                    dir_info["public_ready_count"] += 1
-                else:
-                    dir_info["needs_cleaning_count"] += 1
-                
-                if file_info["has_secrets"]:
-                    dir_info["secrets_count"] += 1
+            item = Path(entry.path)
+            if entry.is_dir():
+                dir_info["_pending"].append(("dir", audit_directory(item, project_root, jobs)))
+            elif entry.is_file():
+                dir_info["_pending"].append(("file", len(jobs)))
+                jobs.append((item, project_root, entry.stat()))
     except PermissionError:
         dir_info["error"] = "Permission denied"
     except Exception as e:
@@ -223,6 +277,38 @@ def audit_directory(dir_path: Path, project_root: Path) -> dict:
     
     return dir_info
 
+def fill_directory(dir_info: dict, file_results: list) -> dict:
+    """Attach audited files to a tree from audit_directory and total it up"""
+    for kind, pending in dir_info.pop("_pending"):
+        if kind == "dir":
+            subdir_info = fill_directory(pending, file_results)
+            dir_info["subdirectories"].append(subdir_info)
+            dir_info["total_size_mb"] += subdir_info["total_size_mb"]
+            dir_info["file_count"] += subdir_info["file_count"]
+            dir_info["public_ready_count"] += subdir_info["public_ready_count"]
+            dir_info["needs_cleaning_count"] += subdir_info["needs_cleaning_count"]
+            dir_info["secrets_count"] += subdir_info["secrets_count"]
+        else:
+            file_info = file_results[pending]
+            if isinstance(file_info, Exception):
+                # A failing file ends the directory, as it did when files
+                # were audited inline
+                dir_info["error"] = str(file_info)
+                break
+            dir_info["files"].append(file_info)
+            dir_info["total_size_mb"] += file_info["size_mb"]
+            dir_info["file_count"] += 1
+            
+            if file_info["public_ready"]:
+                dir_info["public_ready_count"] += 1
+            else:
+                dir_info["needs_cleaning_count"] += 1
+            
+            if file_info["has_secrets"]:
+                dir_info["secrets_count"] += 1
+    
+    return dir_info
+
 def generate_summary(audit_results: dict) -> dict:
     """Generate summary statistics"""
     def count_files(dir_info: dict) -> dict:
@@ -290,37 +376,53 @@ def main():
         "secrets_count": 0,
     }
     
+    # Walk everything first, then audit all files in parallel
+    jobs = []
+    
     # Scan root level files
     print("📄 Scanning root directory files...")
+    root_files = []
     for item in PROJECT_ROOT.iterdir():
         if item.is_file() and item.name not in ['.gitignore', '.git', '.env']:
             if not any(item.name.startswith(skip) for skip in ['.', '__']):
-                file_info = audit_file(item, PROJECT_ROOT)
-                audit_results["files"].append(file_info)
-                audit_results["total_size_mb"] += file_info["size_mb"]
-                audit_results["file_count"] += 1
-                if file_info["public_ready"]:
-                    audit_results["public_ready_count"] += 1
-                else:
-                    audit_results["needs_cleaning_count"] += 1
-                if file_info["has_secrets"]:
-                    audit_results["secrets_count"] += 1
+                root_files.append(len(jobs))
+                jobs.append((item, PROJECT_ROOT, item.stat()))
     
     # Scan specified directories
+    dir_trees = []
     for dir_name in SCAN_DIRS:
         dir_path = PROJECT_ROOT / dir_name
         if dir_path.exists() and dir_path.is_dir():
             print(f"📁 Scanning directory: {dir_name}...")
-            dir_info = audit_directory(dir_path, PROJECT_ROOT)
-            audit_results["subdirectories"].append(dir_info)
-            audit_results["total_size_mb"] += dir_info["total_size_mb"]
-            audit_results["file_count"] += dir_info["file_count"]
-            audit_results["public_ready_count"] += dir_info["public_ready_count"]
-            audit_results["needs_cleaning_count"] += dir_info["needs_cleaning_count"]
-            audit_results["secrets_count"] += dir_info["secrets_count"]
+            dir_trees.append(audit_directory(dir_path, PROJECT_ROOT, jobs))
         else:
             print(f"⚠️  Directory not found: {dir_name}")
     
+    file_results = audit_files(jobs)
+    
+    for index in root_files:
+        file_info = file_results[index]
+        if isinstance(file_info, Exception):
+            raise file_info
+        audit_results["files"].append(file_info)
+        audit_results["total_size_mb"] += file_info["size_mb"]
+        audit_results["file_count"] += 1
+        if file_info["public_ready"]:
+            audit_results["public_ready_count"] += 1
+        else:
+            audit_results["needs_cleaning_count"] += 1
+        if file_info["has_secrets"]:
+            audit_results["secrets_count"] += 1
+    
+    for dir_info in dir_trees:
+        fill_directory(dir_info, file_results)
+        audit_results["subdirectories"].append(dir_info)
+        audit_results["total_size_mb"] += dir_info["total_size_mb"]
+        audit_results["file_count"] += dir_info["file_count"]
+        audit_results["public_ready_count"] += dir_info["public_ready_count"]
+        audit_results["needs_cleaning_count"] += dir_info["needs_cleaning_count"]
+        audit_results["secrets_count"] += dir_info["secrets_count"]
+    
     # Generate summary
     summary = generate_summary(audit_results)
     
@@ -331,8 +433,7 @@ def main():
     }
     
     # Save to JSON
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(full_audit, f, indent=2, ensure_ascii=False)
+    OUTPUT_FILE.write_bytes(dumps_json(full_audit, indent=True))
     
     # Print summary
     print("\n" + "="*60)
@@ -10,6 +10,16 @@ import json
 import os
 from pathlib import Path
 
+try:
+    import pyogrio
+    HAVE_PYOGRIO = True
+except ImportError:
+    HAVE_PYOGRIO = False
+
+# pyogrio reads/writes whole layers through GDAL in one call; without it
+# geopandas falls back to its default engine (Fiona)
+IO_ENGINE = {'engine': 'pyogrio'} if HAVE_PYOGRIO else {}
+
 def convert_shapefile_to_geojson():
     # Get the script directory and project root
     script_dir = Path(__file__).parent
@@ -25,7 +35,7 @@ def convert_shapefile_to_geojson():
         raise FileNotFoundError(f"Shapefile not found at: {input_shapefile}")
     
     # Read the shapefile
-    gdf = gpd.read_file(input_shapefile)
+    gdf = gpd.read_file(input_shapefile, **IO_ENGINE)
     
     # Ensure WGS84 coordinate system (EPSG:4326)
     if gdf.crs != 'EPSG:4326':
@@ -48,7 +58,7 @@ def convert_shapefile_to_geojson():
     
     # Save to GeoJSON
     print(f"Writing GeoJSON to: {output_geojson}")
-    gdf.to_file(output_geojson, driver='GeoJSON')
+    gdf.to_file(output_geojson, driver='GeoJSON', **IO_ENGINE)
     
     # Verify the output
     file_size = os.path.getsize(output_geojson) / (1024 * 1024)  # Size in MB
@@ -6,6 +6,16 @@ Convert TWDB_Groundwater shapefile to GeoJSON format
 import geopandas as gpd
 import os
 
+try:
+    import pyogrio
+    HAVE_PYOGRIO = True
+except ImportError:
+    HAVE_PYOGRIO = False
+
+# pyogrio reads/writes whole layers through GDAL in one call; without it
+# geopandas falls back to its default engine (Fiona)
+IO_ENGINE = {'engine': 'pyogrio'} if HAVE_PYOGRIO else {}
+
 def convert_twdb_groundwater():
     # Input shapefile path
     input_shp = "public/data/TWDB_Groundwater.shp"
@@ -21,7 +31,7 @@ def convert_twdb_groundwater():
     try:
         # Read the shapefile
         print(f"Reading shapefile: {input_shp}")
-        gdf = gpd.read_file(input_shp)
+        gdf = gpd.read_file(input_shp, **IO_ENGINE)
         
         # Print info about the data
         print(f"Shape: {gdf.shape}")
@@ -35,7 +45,7 @@ def convert_twdb_groundwater():
         
         # Save as GeoJSON
         print(f"Saving to: {output_geojson}")
-        gdf.to_file(output_geojson, driver='GeoJSON')
+        gdf.to_file(output_geojson, driver='GeoJSON', **IO_ENGINE)
         
         print("Conversion completed successfully!")
         return True
@@ -4,10 +4,11 @@ Create 2-mile circles around specified Texas locations.
 This will create GeoJSON files with circular features for map visualization.
 """
 
-import json
 import math
 import sys
 
+from _jsonio import dumps_json
+
 def create_circle(center_lat, center_lon, radius_miles, num_points=64):
     """
     Create a circular polygon around a center point.
@@ -84,8 +85,8 @@ def main():
         output_file = f'../public/data/{safe_name}_2mile_circle.geojson'
         
         # Save to file
-        with open(output_file, 'w') as f:
-            json.dump(geojson_data, f, separators=(',', ':'))
+        with open(output_file, 'wb') as f:
+            f.write(dumps_json(geojson_data))
         
         print(f"✅ Saved {location_name} circle to: {output_file}")
         
@@ -108,8 +109,8 @@ def main():
     }
     
     combined_file = '../public/data/location_circles_2mile.geojson'
-    with open(combined_file, 'w') as f:
-        json.dump(combined_geojson, f, separators=(',', ':'))
+    with open(combined_file, 'wb') as f:
+        f.write(dumps_json(combined_geojson))
     
     print(f"✅ Saved combined circles to: {combined_file}")
     
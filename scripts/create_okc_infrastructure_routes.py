@@ -6,11 +6,12 @@ Generates routes between key infrastructure sites (Supply and Demand clusters)
 using OSRM routing API.
 """
 
-import json
 import sys
 import requests
 from pathlib import Path
 
+from _jsonio import dumps_json
+
 # Define all marker locations (lat, lon)
 MARKERS = {
     # Infrastructure sites (red markers)
@@ -184,8 +185,7 @@ def main():
         filename = f"{start_name.lower().replace(' ', '_').replace('-', '_')}_to_{end_name.lower().replace(' ', '_').replace('-', '_')}.geojson"
         output_file = output_dir / filename
         
-        with open(output_file, 'w') as f:
-            json.dump(geojson_data, f, separators=(',', ':'))
+        output_file.write_bytes(dumps_json(geojson_data))
         
         print(f"  💾 Saved to: {output_file.name}")
         print()
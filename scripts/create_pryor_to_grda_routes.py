@@ -10,6 +10,8 @@ import sys
 import requests
 from pathlib import Path
 
+from _jsonio import dumps_json
+
 # Pryor coordinates (MidAmerica Industrial Park)
 PRYOR_COORDS = (36.2411, -95.3301)
 
@@ -178,8 +180,7 @@ def main():
         filename = f"pryor_to_{sanitize_filename(facility_name)}.geojson"
         output_file = output_dir / filename
         
-        with open(output_file, 'w') as f:
-            json.dump(geojson_data, f, separators=(',', ':'))
+        output_file.write_bytes(dumps_json(geojson_data))
         
         print(f"  💾 Saved to: {output_file.name}")
         print()
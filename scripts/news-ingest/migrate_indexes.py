@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Bring the indexes of an existing news_pipeline.db up to schema.sql.
+Run this once on databases created before the indexes were added or
+changed (init_db.py only creates missing ones and never replaces the
+older, non-partial projects indexes).
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Database path
+DB_PATH = Path(__file__).parent.parent.parent / "data" / "news" / "news_pipeline.db"
+
+# Index name -> definition, as in schema.sql
+INDEXES = {
+    "idx_ps_pid_lsa": "CREATE INDEX idx_ps_pid_lsa ON project_status(project_id, last_signal_at)",
+    "idx_projects_company": "CREATE INDEX idx_projects_company ON projects(company) WHERE company IS NOT NULL",
+    "idx_projects_location": "CREATE INDEX idx_projects_location ON projects(location_text) WHERE location_text IS NOT NULL",
+}
+
+def _normalize(sql):
+    return " ".join(sql.split()).lower()
+
+def migrate_indexes():
+    """Create missing indexes, rebuild outdated ones, then refresh planner stats."""
+    if not DB_PATH.exists():
+        print(f"❌ Database not found at: {DB_PATH}")
+        return
+    
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+    
+    existing = dict(cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"))
+    changed = []
+    for name, definition in INDEXES.items():
+        if name in existing and _normalize(existing[name]) == _normalize(definition):
+            continue
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.execute(definition)
+        changed.append(name)
+    
+    # Planner statistics, so the new indexes are actually picked
+    cursor.execute("ANALYZE")
+    
+    conn.commit()
+    conn.close()
+    
+    print(f"✅ Indexes up to date in: {DB_PATH}")
+    print(f"   Created/rebuilt: {', '.join(changed) if changed else 'none'}")
+
+if __name__ == "__main__":
+    migrate_indexes()
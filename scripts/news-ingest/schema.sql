@@ -41,6 +41,13 @@ CREATE TABLE IF NOT EXISTS mentions (
 CREATE INDEX IF NOT EXISTS idx_mentions_mention_id ON mentions(mention_id);
 CREATE INDEX IF NOT EXISTS idx_mentions_published_at ON mentions(published_at);
 
+-- Death signal scan results per mention (reused while content_hash is unchanged)
+CREATE TABLE IF NOT EXISTS mention_signals (
+    mention_id TEXT PRIMARY KEY,
+    signals TEXT,  -- JSON array of death signal categories
+    content_hash TEXT  -- blake2b digest of title + raw_text + snippet
+);
+
 -- Phase C: Classification results
 CREATE TABLE IF NOT EXISTS classified_mentions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -100,11 +107,8 @@ CREATE TABLE IF NOT EXISTS projects (
     updated_at TEXT DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_projects_company ON projects(company);
-CREATE INDEX IF NOT EXISTS idx_projects_location ON projects(location_text);
-
-CREATE INDEX IF NOT EXISTS idx_projects_company ON projects(company);
-CREATE INDEX IF NOT EXISTS idx_projects_location ON projects(location_text);
+CREATE INDEX IF NOT EXISTS idx_projects_company ON projects(company) WHERE company IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_projects_location ON projects(location_text) WHERE location_text IS NOT NULL;
 
 -- Phase F: Status tracking
 CREATE TABLE IF NOT EXISTS project_status (
@@ -119,4 +123,5 @@ CREATE TABLE IF NOT EXISTS project_status (
 );
 
 CREATE INDEX IF NOT EXISTS idx_status_current ON project_status(status_current);
+CREATE INDEX IF NOT EXISTS idx_ps_pid_lsa ON project_status(project_id, last_signal_at);
 
@@ -94,6 +94,15 @@ def geocode_all_projects(db_path: Path):
             cursor.execute("ALTER TABLE projects ADD COLUMN geocode_confidence TEXT")
             conn.commit()
         
+        # Covering index for Texas bounding-box reads of geocoded projects
+        # (perplexity_seed_projects.py de-duplication), served from the
+        # index alone; it lives here because this script owns lat/lng
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_projects_texas "
+            "ON projects(lat, lng, company, location_text, announced_date)"
+        )
+        conn.commit()
+        
         # Fetch projects without coordinates
         cursor.execute("""
             SELECT project_id, location_text, lat, lng